@@ -1,22 +1,92 @@
-from fastapi import APIRouter, HTTPException, Request
-from datetime import datetime, date
-from motor.motor_asyncio import AsyncIOMotorClient
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from datetime import datetime, date, timedelta
+from typing import Optional
 import os
-from dotenv import load_dotenv
-
-load_dotenv()
+import uuid
+import asyncio
+import logging
+import base64
+from bson import ObjectId
+from bson.errors import InvalidId
+from backend.auth import get_current_user
+from backend.availability_stream import CLOSED, availability_broadcaster
+from backend.cache import TTLCache
+from backend.database import db, in_transaction, indexes_ready, register_indexes
+from backend.jobs import enqueue_side_effects, job_handler
+from backend.loaders import services_by_id
+from backend.models import BatchBookingCreate, User
+from backend.pagination import decode_cursor, encode_cursor, keyset_filter, page_limit, parse_datetime
+from backend.serializers import dumps_json, serialize_mongo_document
 
 router = APIRouter(prefix="/api")
 
-# MongoDB connection
-client = AsyncIOMotorClient(os.getenv("MONGO_URL"))
-db = client[os.getenv("DB_NAME")]
+logger = logging.getLogger(__name__)
+
+# --- Availability calendar config ---
+AVAILABILITY_MAX_SERVICES = 200
+AVAILABILITY_MAX_DAYS = 400
+AVAILABILITY_CACHE_TTL_SECONDS = float(os.getenv("AVAILABILITY_CACHE_TTL_SECONDS", "60"))
+
+# (service_id, "YYYY-MM") -> sorted tuple of booked days of that month
+availability_cache = TTLCache(maxsize=50000, ttl=AVAILABILITY_CACHE_TTL_SECONDS)
+# (service_id, "YYYY-MM") -> availability_generation when a booking last invalidated it. A read
+# that started before that must not cache what it read; older invalidations can expire.
+availability_invalidations = TTLCache(maxsize=50000, ttl=AVAILABILITY_CACHE_TTL_SECONDS)
+availability_generation = 0
+
+
+def invalidate_booked_month(service_id: str, appointment_date: datetime):
+    global availability_generation
+    key = (service_id, appointment_date.strftime("%Y-%m"))
+    availability_generation += 1
+    availability_invalidations.set(key, availability_generation)
+    availability_cache.pop(key)
+
+# --- Paged booking lists ---
+BOOKED_DATES_PAGE_SIZE = 100
+BOOKED_DATES_MAX_PAGE_SIZE = 1000
+MY_BOOKINGS_SORT = [("appointment_date", -1), ("_id", -1)]
+
+# --- Live availability (server-sent events) ---
+# Comment lines keep proxies from closing an idle stream
+AVAILABILITY_STREAM_HEARTBEAT_SECONDS = float(os.getenv("AVAILABILITY_STREAM_HEARTBEAT_SECONDS", "15"))
+AVAILABILITY_STREAM_RETRY_MS = 5000
+
+
+@register_indexes
+async def ensure_appointment_indexes():
+    """
+    One booking per (service_id, appointment_date), enforced by Mongo.
+    """
+    from pymongo.errors import OperationFailure
+
+    try:
+        await db.appointments.create_index(
+            [("service_id", 1), ("appointment_date", 1)],
+            unique=True,
+            name="service_date_unique",
+        )
+    except OperationFailure as e:
+        # Existing double bookings block the unique index; they have to be cleaned up by hand
+        logger.error("Could not create unique appointments index: %s", e)
+    # ✅ "My bookings", newest first, one range scan per page
+    await db.appointments.create_index([("user_email", 1), ("appointment_date", -1), ("_id", -1)])
+
+
+def object_id(value: str) -> ObjectId:
+    try:
+        return ObjectId(value)
+    except InvalidId:
+        raise ValueError(value)
 
 @router.post("/book-appointment")
 async def book_appointment(request: Request):
     """
     Book a service appointment if the date is available.
     """
+    from pymongo.errors import DuplicateKeyError  # deferred: keeps pymongo off the cold-start path
+
     try:
         data = await request.json()
         user_email = data.get("email", "guest@example.com")
@@ -32,15 +102,7 @@ async def book_appointment(request: Request):
             datetime.fromisoformat(appointment_date_str).date(), datetime.min.time()
         )
 
-        # ✅ Check if already booked
-        existing = await db.appointments.find_one({
-            "service_id": service_id,
-            "appointment_date": appointment_date
-        })
-        if existing:
-            raise HTTPException(status_code=400, detail="This date is already booked for the selected service")
-
-        # ✅ Save booking
+        # ✅ Save booking; the unique index rejects an already booked date atomically
         appointment = {
             "user_email": user_email,
             "service_id": service_id,
@@ -50,7 +112,14 @@ async def book_appointment(request: Request):
             "created_at": datetime.utcnow()
         }
 
-        await db.appointments.insert_one(appointment)
+        await indexes_ready()
+        try:
+            await db.appointments.insert_one(dict(appointment))
+        except DuplicateKeyError:
+            raise HTTPException(status_code=400, detail="This date is already booked for the selected service")
+        invalidate_booked_month(service_id, appointment_date)
+        # ✅ Confirmations and alerts run in the job queue, not on this request
+        await enqueue_side_effects("appointments.booked", booked_job_payload([appointment]))
         return {"message": "Appointment booked successfully!", "appointment": appointment}
 
     except HTTPException as e:
@@ -59,16 +128,307 @@ async def book_appointment(request: Request):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# --- Post-booking jobs ---
+def booked_job_payload(appointments: list) -> dict:
+    first = appointments[0]
+    return {
+        "email": first["user_email"],
+        "payment_id": first["payment_id"],
+        "slots": [{"service_id": a["service_id"], "appointment_date": a["appointment_date"]} for a in appointments],
+    }
+
+
+@job_handler("appointments.booked")
+async def notify_booked(payload: dict):
+    """
+    Customer confirmation and provider alerts for one booking request. There is no
+    mail / SMS provider yet, so the messages are logged.
+    """
+    services = await services_by_id.load_many([slot["service_id"] for slot in payload["slots"]])
+    for slot, service in zip(payload["slots"], services):
+        day = slot["appointment_date"].strftime("%Y-%m-%d")
+        name = service["name"] if service else slot["service_id"]
+        logger.info("Booking confirmation to %s: %s on %s", payload["email"], name, day)
+        if service and service.get("contact_email"):
+            logger.info("New booking alert to %s: %s on %s", service["contact_email"], name, day)
+
+
+async def insert_all_or_nothing(appointments: list):
+    """
+    Insert every appointment or none: one unordered bulk_write in a transaction,
+    retried on transient errors. A standalone mongod has no transactions, so there
+    the ones that did go in are deleted again when any insert fails.
+    """
+    from pymongo import InsertOne
+    from pymongo.errors import BulkWriteError
+
+    await indexes_ready()
+    writes = [InsertOne(appointment) for appointment in appointments]
+
+    async def write(session):
+        if session is not None:
+            await db.appointments.bulk_write(writes, ordered=False, session=session)
+            return
+        try:
+            await db.appointments.bulk_write(writes, ordered=False)
+        except BulkWriteError as e:
+            failed = {error["index"] for error in e.details.get("writeErrors", [])}
+            inserted = [a["_id"] for i, a in enumerate(appointments) if i not in failed]
+            if inserted:
+                await db.appointments.delete_many({"_id": {"$in": inserted}})
+            raise
+
+    await in_transaction(write)
+
+
+async def find_taken_slots(appointments: list) -> list:
+    slots = [{"service_id": a["service_id"], "appointment_date": a["appointment_date"]} for a in appointments]
+    taken = set()
+    # ✅ Point lookups on the (service_id, appointment_date) unique index, covered
+    async for a in db.appointments.find({"$or": slots}, {"_id": 0, "service_id": 1, "appointment_date": 1}):
+        taken.add((a["service_id"], a["appointment_date"]))
+    return [
+        {"service_id": slot["service_id"], "appointment_date": slot["appointment_date"].strftime("%Y-%m-%d")}
+        for slot in slots if (slot["service_id"], slot["appointment_date"]) in taken
+    ]
+
+
+@router.post("/book-appointments")
+async def book_appointments(booking: BatchBookingCreate):
+    """
+    Book several (service_id, date) slots under one payment, e.g. venue, catering
+    and photography for the wedding day. Either every slot is booked or none is;
+    a 409 lists exactly the slots that were already taken.
+    """
+    from pymongo.errors import BulkWriteError  # deferred: keeps pymongo off the cold-start path
+
+    service_ids = list(dict.fromkeys(slot.service_id for slot in booking.slots))
+    services = await services_by_id.load_many(service_ids)
+    unknown = [
+        service_id for service_id, service in zip(service_ids, services)
+        if service is None or not service.get("availability", True)
+    ]
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Unknown or unavailable services: {', '.join(unknown)}")
+
+    # booking_group ties the slots of one request together, alongside the shared payment_id
+    booking_group = str(uuid.uuid4())
+    created_at = datetime.utcnow()
+    appointments = [
+        {
+            "user_email": booking.email,
+            "service_id": slot.service_id,
+            "appointment_date": datetime.combine(slot.appointment_date, datetime.min.time()),
+            "payment_id": booking.payment_id or "manual_booking_no_payment",
+            "booking_group": booking_group,
+            "status": "booked",
+            "created_at": created_at,
+        }
+        for slot in booking.slots
+    ]
+
+    try:
+        await insert_all_or_nothing(appointments)
+    except BulkWriteError:
+        conflicts = await find_taken_slots(appointments)
+        raise HTTPException(status_code=409, detail={"message": "Some slots are already booked", "conflicts": conflicts})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    for a in appointments:
+        invalidate_booked_month(a["service_id"], a["appointment_date"])
+    await enqueue_side_effects("appointments.booked", booked_job_payload(appointments))
+    return {
+        "message": f"{len(appointments)} appointments booked successfully!",
+        "booking_group": booking_group,
+        "appointments": [serialize_mongo_document(a) for a in appointments],
+    }
+
+
 @router.get("/booked-dates/{service_id}")
-async def get_booked_dates(service_id: str):
+async def get_booked_dates(service_id: str, limit: int = BOOKED_DATES_PAGE_SIZE, cursor: Optional[str] = None):
     """
-    Return all booked date strings for a given service_id.
+    Booked date strings for a given service_id, earliest first, `limit` per page.
+    Pass `next_cursor` back as `cursor` for the following page.
     """
+    if not 1 <= limit <= BOOKED_DATES_MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be 1-{BOOKED_DATES_MAX_PAGE_SIZE}")
+    # appointment_date is unique per service, so it is the whole sort key
+    query = {"service_id": service_id}
+    if cursor:
+        query["appointment_date"] = {"$gt": decode_cursor(cursor, [parse_datetime])[0]}
     try:
-        appointments = await db.appointments.find({"service_id": service_id}).to_list(100)
-        booked_dates = [
-            a["appointment_date"].strftime("%Y-%m-%d") for a in appointments
-        ]
-        return {"service_id": service_id, "booked_dates": booked_dates}
+        # ✅ Covered range scan on the (service_id, appointment_date) unique index
+        appointments = await db.appointments.find(
+            query, {"_id": 0, "appointment_date": 1}
+        ).sort("appointment_date", 1).to_list(limit + 1)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    page = appointments[:limit]
+    next_cursor = encode_cursor([page[-1]["appointment_date"]]) if len(appointments) > limit else None
+    return {
+        "service_id": service_id,
+        "booked_dates": [a["appointment_date"].strftime("%Y-%m-%d") for a in page],
+        "next_cursor": next_cursor,
+    }
+
+
+async def availability_events(service_id: str):
+    queue = availability_broadcaster.subscribe(service_id)
+    try:
+        yield f"retry: {AVAILABILITY_STREAM_RETRY_MS}\n\n"
+        watching = asyncio.ensure_future(availability_broadcaster.wait_watching())
+        try:
+            while not watching.done():
+                await asyncio.wait({watching}, timeout=AVAILABILITY_STREAM_HEARTBEAT_SECONDS)
+                if not watching.done():
+                    yield ": keepalive\n\n"
+        finally:
+            watching.cancel()
+        if availability_broadcaster.unsupported:
+            yield "event: unavailable\ndata: {}\n\n"
+            return
+        # From here on no booking is missed; the client (re)loads booked-dates now
+        yield "event: ready\ndata: {}\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), AVAILABILITY_STREAM_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if event is CLOSED:
+                return
+            yield f"event: booked\ndata: {dumps_json(event).decode()}\n\n"
+    finally:
+        availability_broadcaster.unsubscribe(service_id, queue)
+
+
+@router.get("/booked-dates/{service_id}/stream")
+async def stream_booked_dates(service_id: str):
+    """
+    Server-sent events for one service's calendar: `ready` once live, then a
+    `booked` event ({"service_id", "date"}) for every new booking. Reload
+    /api/booked-dates on `ready`, including after an automatic reconnect.
+    """
+    if availability_broadcaster.unsupported:
+        raise HTTPException(status_code=503, detail="Live availability needs MongoDB running as a replica set")
+    return StreamingResponse(
+        availability_events(service_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/my-bookings")
+async def get_my_bookings(limit: int = 20, cursor: Optional[str] = None, current_user: User = Depends(get_current_user)):
+    """
+    The signed-in user's bookings, latest appointment date first, `limit` per page.
+    Pass `next_cursor` back as `cursor` for older ones.
+    """
+    limit = page_limit(limit)
+    query = {"user_email": current_user.email}
+    if cursor:
+        query = {"$and": [query, keyset_filter(MY_BOOKINGS_SORT, decode_cursor(cursor, [parse_datetime, object_id]))]}
+    appointments = await db.appointments.find(query).sort(MY_BOOKINGS_SORT).to_list(limit + 1)
+    page = appointments[:limit]
+    next_cursor = None
+    if len(appointments) > limit:
+        next_cursor = encode_cursor([page[-1]["appointment_date"], page[-1]["_id"]])
+    return {"bookings": [serialize_mongo_document(a) for a in page], "next_cursor": next_cursor}
+
+
+# --- Availability calendar ---
+def month_starts(start: date, end: date):
+    current = start.replace(day=1)
+    while current <= end:
+        yield current
+        current = (current + timedelta(days=32)).replace(day=1)
+
+
+async def load_booked_days(service_ids, start: date, end: date):
+    """
+    Booked days per (service_id, month) for every month touching [start, end].
+    Cached months are served from memory; the rest come from one range query on the
+    (service_id, appointment_date) index, covered by its projection.
+    """
+    months = list(month_starts(start, end))
+    month_keys = [m.strftime("%Y-%m") for m in months]
+    result = {}
+    missing = []
+    for service_id in service_ids:
+        for key in month_keys:
+            days = availability_cache.get((service_id, key))
+            if days is None:
+                missing.append(service_id)
+                break
+            result[(service_id, key)] = days
+
+    if missing:
+        generation = availability_generation
+        range_start = datetime.combine(months[0], datetime.min.time())
+        range_end = datetime.combine((months[-1] + timedelta(days=32)).replace(day=1), datetime.min.time())
+        fetched = {(service_id, key): [] for service_id in missing for key in month_keys}
+        cursor = db.appointments.find(
+            {"service_id": {"$in": missing}, "appointment_date": {"$gte": range_start, "$lt": range_end}},
+            {"_id": 0, "service_id": 1, "appointment_date": 1},
+        )
+        async for a in cursor:
+            fetched[(a["service_id"], a["appointment_date"].strftime("%Y-%m"))].append(a["appointment_date"].day)
+        for cache_key, days in fetched.items():
+            days = tuple(sorted(days))
+            # Don't cache a month that a booking changed while we were reading it
+            if availability_invalidations.get(cache_key, 0) <= generation:
+                availability_cache.set(cache_key, days)
+            result[cache_key] = days
+    return result
+
+
+def encode_bitmap(booked, start: date, end: date) -> str:
+    """
+    Base64 bitmap with one bit per day from `start`; bit i lives in byte i // 8 at
+    position i % 8 (least significant first) and is set when that day is booked.
+    """
+    bits = bytearray(((end - start).days + 8) // 8)
+    for day in booked:
+        offset = (day - start).days
+        bits[offset // 8] |= 1 << (offset % 8)
+    return base64.b64encode(bytes(bits)).decode("ascii")
+
+
+@router.get("/availability")
+async def get_availability(service_ids: str, start: str, end: str, format: Optional[str] = "days"):
+    """
+    Booked dates for many services over a date range in one request.
+    `service_ids` is comma separated; `format` is "days" (list of dates) or "bitmap".
+    """
+    ids = list(dict.fromkeys(i.strip() for i in service_ids.split(",") if i.strip()))
+    try:
+        start_date = date.fromisoformat(start)
+        end_date = date.fromisoformat(end)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="start and end must be YYYY-MM-DD dates")
+    if not ids or len(ids) > AVAILABILITY_MAX_SERVICES:
+        raise HTTPException(status_code=400, detail=f"Provide 1-{AVAILABILITY_MAX_SERVICES} service ids")
+    if end_date < start_date or (end_date - start_date).days >= AVAILABILITY_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range must be 1-{AVAILABILITY_MAX_DAYS} days")
+    if format not in ("days", "bitmap"):
+        raise HTTPException(status_code=400, detail="format must be 'days' or 'bitmap'")
+
+    try:
+        month_days = await load_booked_days(ids, start_date, end_date)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    services = {}
+    for service_id in ids:
+        booked = []
+        for month in month_starts(start_date, end_date):
+            for day in month_days[(service_id, month.strftime("%Y-%m"))]:
+                booked_date = month.replace(day=day)
+                if start_date <= booked_date <= end_date:
+                    booked.append(booked_date)
+        if format == "bitmap":
+            services[service_id] = {"bitmap": encode_bitmap(booked, start_date, end_date)}
+        else:
+            services[service_id] = {"booked_dates": [d.isoformat() for d in booked]}
+    return {"start": start_date.isoformat(), "end": end_date.isoformat(), "format": format, "services": services}
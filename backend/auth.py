@@ -0,0 +1,67 @@
+from fastapi import Depends, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from datetime import datetime, timedelta
+import os
+import jwt
+from backend.cache import TTLCache
+from backend.loaders import users_by_id
+from backend.models import User
+
+# --- JWT Config ---
+JWT_SECRET = os.environ.get("JWT_SECRET")
+if not JWT_SECRET:
+    raise RuntimeError("JWT_SECRET must be set in Vercel")
+
+JWT_ALGORITHM = "HS256"
+JWT_EXPIRATION_HOURS = 24
+
+# Embed the user profile in the token so get_current_user can skip Mongo entirely.
+# Profile edits only reach such tokens when they are reissued (update-profile returns one).
+JWT_EMBED_USER_CLAIMS = os.environ.get("JWT_EMBED_USER_CLAIMS", "false").lower() == "true"
+
+# --- Authenticated user cache ---
+USER_CACHE_TTL_SECONDS = float(os.environ.get("USER_CACHE_TTL_SECONDS", "30"))
+USER_CACHE_MAX_ENTRIES = int(os.environ.get("USER_CACHE_MAX_ENTRIES", "10000"))
+
+# Comma-separated emails allowed to use the catalog admin endpoints
+ADMIN_EMAILS = {e.strip().lower() for e in os.environ.get("ADMIN_EMAILS", "").split(",") if e.strip()}
+
+# --- Security ---
+security = HTTPBearer()
+
+user_cache = TTLCache(maxsize=USER_CACHE_MAX_ENTRIES, ttl=USER_CACHE_TTL_SECONDS)
+
+def create_jwt_token(user: User) -> str:
+    payload = {"user_id": user.id, "exp": datetime.utcnow() + timedelta(hours=JWT_EXPIRATION_HOURS)}
+    if JWT_EMBED_USER_CLAIMS:
+        payload["profile"] = jsonable_encoder(user)
+    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    try:
+        payload = jwt.decode(credentials.credentials, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        user_id = payload.get("user_id")
+        if not user_id:
+            raise HTTPException(status_code=401, detail="Invalid token")
+        profile = payload.get("profile")
+        if profile and profile.get("id") == user_id:
+            return User(**profile)
+        user = user_cache.get(user_id)
+        if user is None:
+            # ✅ Concurrent requests for the same (or any) users share one $in query
+            record = await users_by_id.load(user_id)
+            if not record:
+                raise HTTPException(status_code=401, detail="User not found")
+            user = User(**record)
+            user_cache.set(user_id, user)
+        return user
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(status_code=401, detail="Token expired")
+    except jwt.PyJWTError:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+async def get_admin_user(current_user: User = Depends(get_current_user)):
+    if current_user.email.lower() not in ADMIN_EMAILS:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
@@ -0,0 +1,205 @@
+import heapq
+import re
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+WORD_START_RE = re.compile(r"\b\w")
+SUGGESTION_TYPES = ("service", "category", "location")
+# Added to the score of an entry that starts its phrase, above any weight
+PHRASE_START_BONUS = 1e9
+
+
+def normalize(text: Optional[str]) -> str:
+    return " ".join((text or "").lower().split())
+
+
+def phrase_keys(text: str) -> List[str]:
+    """
+    "Royal Palace Hall" -> ["royal palace hall", "palace hall", "hall"], so typing
+    the start of any word finds the whole phrase.
+    """
+    normalized = normalize(text)
+    return [normalized[m.start():] for m in WORD_START_RE.finditer(normalized)]
+
+
+class AutocompleteIndex:
+    """
+    Typeahead over service names, categories and locations: per type, a sorted array
+    of word-start keys searched with bisect, plus a segment tree for top-k by rank.
+    Phrases that start with the typed text come first, then services by rating and
+    categories / locations by how many available services they have.
+    """
+
+    def __init__(self, max_results: int = 20):
+        self.max_results = max_results
+        self.docs: Dict[str, Tuple[str, str, str]] = {}
+        # (type, key) -> suggestion; `weight` is the rating or the service count
+        self.suggestions: Dict[Tuple[str, str], dict] = {}
+        # type -> (keys, entries, scores, tree, size), see build_range
+        self._ranges: Dict[str, tuple] = {kind: build_range([], []) for kind in SUGGESTION_TYPES}
+        # suggestion key -> its entries' positions in its type's range
+        self._positions: Dict[Tuple[str, str], List[int]] = {}
+        self._dirty = False
+
+    def __len__(self):
+        return len(self.docs)
+
+    # --- Writes ---
+    def add(self, service: dict):
+        service_id = service["id"]
+        if service_id in self.docs:
+            self.remove(service_id)
+        if not service.get("availability", True) or not service.get("name"):
+            return
+        category = service.get("category") or ""
+        category = getattr(category, "value", category)
+        location = service.get("location") or ""
+        self.docs[service_id] = (service["name"], category, location)
+        self.suggestions[("service", service_id)] = {
+            "type": "service", "text": service["name"], "id": service_id, "weight": service.get("rating") or 0.0,
+        }
+        for kind, text in (("category", category), ("location", location)):
+            if normalize(text):
+                suggestion = self.suggestions.setdefault((kind, normalize(text)), {"type": kind, "text": text, "weight": 0})
+                suggestion["weight"] += 1
+        self._dirty = True
+
+    def remove(self, service_id: str):
+        doc = self.docs.pop(service_id, None)
+        if doc is None:
+            return
+        _, category, location = doc
+        self.suggestions.pop(("service", service_id), None)
+        for kind, text in (("category", category), ("location", location)):
+            key = (kind, normalize(text))
+            suggestion = self.suggestions.get(key)
+            if suggestion:
+                suggestion["weight"] -= 1
+                if suggestion["weight"] <= 0:
+                    del self.suggestions[key]
+        self._dirty = True
+
+    def rebuild(self, services: Iterable[dict]):
+        self.__init__(self.max_results)
+        for service in services:
+            self.add(service)
+
+    # --- Reads ---
+    def refresh(self):
+        """
+        Re-sort the word-start keys and rebuild the max-score segment trees over them,
+        one per suggestion type, after writes.
+        """
+        if not self._dirty:
+            return
+        by_type = {kind: [] for kind in SUGGESTION_TYPES}
+        for suggestion_key in self.suggestions:
+            for entry_key in phrase_keys(self.suggestions[suggestion_key]["text"]):
+                by_type[suggestion_key[0]].append((entry_key, suggestion_key))
+        self._ranges, self._positions = {}, {}
+        for kind, entries in by_type.items():
+            entries.sort()
+            scores = [self._score(entry_key, suggestion_key) for entry_key, suggestion_key in entries]
+            for position, (_, suggestion_key) in enumerate(entries):
+                self._positions.setdefault(suggestion_key, []).append(position)
+            self._ranges[kind] = build_range(entries, scores)
+        self._dirty = False
+
+    def _score(self, entry_key: str, suggestion_key: Tuple[str, str]) -> float:
+        suggestion = self.suggestions[suggestion_key]
+        bonus = PHRASE_START_BONUS if entry_key == normalize(suggestion["text"]) else 0
+        return suggestion["weight"] + bonus
+
+    def set_weight(self, suggestion_key: Tuple[str, str], weight: float):
+        """
+        Re-rank one suggestion in place, e.g. a service whose rating changed: only its
+        few entries and their paths up the segment tree, not a full refresh.
+        """
+        suggestion = self.suggestions.get(suggestion_key)
+        if suggestion is None:
+            return
+        suggestion["weight"] = weight
+        if self._dirty:
+            return  # the pending refresh scores it anyway
+        _, entries, scores, tree, size = self._ranges[suggestion_key[0]]
+        for position in self._positions.get(suggestion_key, ()):
+            scores[position] = self._score(entries[position][0], suggestion_key)
+            node = (position + size) // 2
+            while node:
+                tree[node] = best_of(scores, tree[2 * node], tree[2 * node + 1])
+                node //= 2
+
+    def suggest(self, prefix: str, limit: int = 10, types: Optional[Iterable[str]] = None) -> List[dict]:
+        """
+        Top `limit` suggestions whose text has a word starting with `prefix`. Per type,
+        the matching entries are one contiguous range of the sorted keys; the segment
+        trees yield those ranges' best entries in order, so cost doesn't grow with
+        their size, and types left out are never searched.
+        """
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        self.refresh()
+        limit = min(limit, self.max_results)
+        kinds = [kind for kind in SUGGESTION_TYPES if not types or kind in types]
+
+        heap = []
+        for position, kind in enumerate(kinds):
+            keys, _, scores, tree, size = self._ranges[kind]
+            low = bisect_left(keys, prefix) + size
+            high = bisect_left(keys, prefix + "\uffff") + size
+            while low < high:
+                if low & 1:
+                    heap.append((-scores[tree[low]], position, tree[low], -low))
+                    low += 1
+                if high & 1:
+                    high -= 1
+                    heap.append((-scores[tree[high]], position, tree[high], -high))
+                low //= 2
+                high //= 2
+        heapq.heapify(heap)
+
+        results, seen = [], set()
+        while heap and len(results) < limit:
+            # Equal scores: the same best entry's subtree is followed straight down (deepest
+            # node first) rather than breadth-first across every tied subtree
+            _, position, _, node = heapq.heappop(heap)
+            node = -node
+            _, entries, scores, tree, size = self._ranges[kinds[position]]
+            if node < size:
+                for child in (2 * node, 2 * node + 1):
+                    if tree[child] >= 0:
+                        heapq.heappush(heap, (-scores[tree[child]], position, tree[child], -child))
+                continue
+            suggestion = self.suggestions[entries[node - size][1]]
+            # Vendors sharing a name show once, as the best-rated of them
+            shown_as = (suggestion["type"], suggestion["text"].lower())
+            if shown_as in seen:
+                continue
+            seen.add(shown_as)
+            result = {"type": suggestion["type"], "text": suggestion["text"]}
+            if suggestion["type"] == "service":
+                result["id"] = suggestion["id"]
+            else:
+                result["count"] = suggestion["weight"]
+            results.append(result)
+        return results
+
+
+def build_range(entries: List[Tuple[str, Tuple[str, str]]], scores: List[int]) -> tuple:
+    """
+    (keys, entries, scores, tree, size): the sorted keys for bisect plus a segment tree
+    whose nodes hold the index of their subtree's best-scoring entry (-1 when empty).
+    """
+    size = 1
+    while size < len(entries):
+        size *= 2
+    tree = [-1] * (2 * size)
+    tree[size:size + len(entries)] = range(len(entries))
+    for node in range(size - 1, 0, -1):
+        tree[node] = best_of(scores, tree[2 * node], tree[2 * node + 1])
+    return [entry_key for entry_key, _ in entries], entries, scores, tree, size
+
+
+def best_of(scores: List[float], left: int, right: int) -> int:
+    return left if right < 0 or (left >= 0 and scores[left] >= scores[right]) else right
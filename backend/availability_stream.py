@@ -0,0 +1,152 @@
+import asyncio
+import logging
+import os
+from typing import Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# --- Live availability config ---
+AVAILABILITY_STREAM_QUEUE_SIZE = int(os.environ.get("AVAILABILITY_STREAM_QUEUE_SIZE", "100"))
+# How long one getMore waits for new changes; also how soon an idle stream notices it has no listeners
+CHANGE_STREAM_MAX_AWAIT_MS = int(os.environ.get("CHANGE_STREAM_MAX_AWAIT_MS", "1000"))
+CHANGE_STREAM_MAX_RETRY_SECONDS = 30.0
+
+# Server error code for $changeStream on a standalone mongod
+CHANGE_STREAMS_UNSUPPORTED = 40573
+
+# Sent to a subscriber whose stream is over (too slow to keep up, or no change streams)
+CLOSED = None
+
+
+class AvailabilityBroadcaster:
+    """
+    One change stream on `appointments` inserts per worker, fanned out in-process to
+    every subscriber of the booked service, so thousands of open calendars cost a
+    single server-side cursor. The stream opens with the first subscriber and closes
+    shortly after the last one leaves.
+
+    Change streams need a replica set; locally a single node is enough:
+    `mongod --replSet rs0`, then `rs.initiate()` once in mongosh, and
+    MONGO_URL=mongodb://localhost:27017/?replicaSet=rs0
+    """
+
+    def __init__(self, queue_size: int = AVAILABILITY_STREAM_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self.unsupported = False
+        self._watching: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self.subscribers.values())
+
+    def subscribe(self, service_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self.subscribers.setdefault(service_id, set()).add(queue)
+        if self.unsupported:
+            self._close(service_id, queue)
+        elif self._task is None or self._task.done():
+            self._watching = asyncio.Event()
+            self._task = asyncio.ensure_future(self._run())
+        return queue
+
+    def unsubscribe(self, service_id: str, queue: asyncio.Queue):
+        queues = self.subscribers.get(service_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self.subscribers[service_id]
+
+    async def wait_watching(self):
+        """
+        Returns once the change stream is open, so every insert after this point reaches
+        the subscriber; reading the current booked dates now leaves no gap.
+        """
+        if self._watching is not None and not self.unsupported:
+            await self._watching.wait()
+
+    def publish(self, service_id: str, event: dict):
+        for queue in list(self.subscribers.get(service_id, ())):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # A client this far behind is dropped; it reconnects and refetches
+                self._close(service_id, queue)
+
+    def _close(self, service_id: str, queue: asyncio.Queue):
+        self.unsubscribe(service_id, queue)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(CLOSED)
+
+    def _close_all(self):
+        for service_id, queues in list(self.subscribers.items()):
+            for queue in list(queues):
+                self._close(service_id, queue)
+
+    async def _run(self):
+        from pymongo.errors import OperationFailure, PyMongoError
+        from backend.database import db
+
+        # Only inserts, and only the two fields the events carry
+        pipeline = [
+            {"$match": {"operationType": "insert"}},
+            {"$project": {"fullDocument.service_id": 1, "fullDocument.appointment_date": 1}},
+        ]
+        resume_token = None
+        retry_seconds = 1.0
+        # No await between this check and returning, so a new subscriber either keeps
+        # this loop going or finds the task done and starts another
+        while self.subscribers:
+            try:
+                async with db.appointments.watch(
+                    pipeline, resume_after=resume_token, max_await_time_ms=CHANGE_STREAM_MAX_AWAIT_MS
+                ) as stream:
+                    self._watching.set()
+                    retry_seconds = 1.0
+                    try:
+                        while self.subscribers:
+                            change = await stream.try_next()
+                            # Advances on empty batches too, so a reopen resumes from here
+                            resume_token = stream.resume_token
+                            if change is None:
+                                continue
+                            appointment = change.get("fullDocument") or {}
+                            service_id = appointment.get("service_id")
+                            if service_id in self.subscribers and appointment.get("appointment_date"):
+                                self.publish(service_id, {
+                                    "service_id": service_id,
+                                    "date": appointment["appointment_date"].strftime("%Y-%m-%d"),
+                                })
+                    finally:
+                        # Not live until the stream reopens; new subscribers wait for that before `ready`
+                        self._watching.clear()
+            except OperationFailure as e:
+                if e.code == CHANGE_STREAMS_UNSUPPORTED:
+                    logger.error("Live availability disabled, MongoDB is not a replica set: %s", e)
+                    self.unsupported = True
+                    self._watching.set()
+                    self._close_all()
+                    return
+                logger.warning("Availability change stream failed, retrying in %.0fs: %s", retry_seconds, e)
+            except PyMongoError as e:
+                logger.warning("Availability change stream failed, retrying in %.0fs: %s", retry_seconds, e)
+            else:
+                continue
+            # Resuming from the last token replays what was missed while reconnecting
+            await asyncio.sleep(retry_seconds)
+            retry_seconds = min(retry_seconds * 2, CHANGE_STREAM_MAX_RETRY_SECONDS)
+
+    async def stop(self):
+        self._close_all()
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+
+availability_broadcaster = AvailabilityBroadcaster()
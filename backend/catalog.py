@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Optional
+from backend.autocomplete import AutocompleteIndex
+from backend.cache import TTLCache
+from backend.database import db
+from backend.search import ServiceSearchIndex, location_tokens
+
+logger = logging.getLogger(__name__)
+
+# --- Services search index ---
+SEARCH_INDEX_TTL_SECONDS = int(os.environ.get("SEARCH_INDEX_TTL_SECONDS", "300"))
+SEARCH_INDEX_PROJECTION = {"_id": 0, "id": 1, "name": 1, "description": 1, "location": 1, "category": 1, "availability": 1, "rating": 1}
+AUTOCOMPLETE_MAX_LIMIT = int(os.environ.get("AUTOCOMPLETE_MAX_LIMIT", "20"))
+# Small batches: the rebuild yields to requests between them instead of indexing a 16 MB batch in one go
+SEARCH_INDEX_SCAN_BATCH = 1000
+
+service_index: Optional[ServiceSearchIndex] = None
+autocomplete_index: Optional[AutocompleteIndex] = None
+service_index_built_at = 0.0
+# Bumped by writes that the next index build must include
+service_index_version = 0
+service_index_rebuild: Optional[asyncio.Task] = None
+
+async def rebuild_service_index():
+    """
+    Scan the catalog into fresh search and autocomplete indexes and swap them in.
+    Cached lists were built from the old index, so they are dropped.
+    """
+    global service_index, autocomplete_index, service_index_built_at, catalog_generation
+    version = service_index_version
+    new_index = ServiceSearchIndex()
+    new_autocomplete = AutocompleteIndex(max_results=AUTOCOMPLETE_MAX_LIMIT)
+    cursor = db.services.find({"id": {"$exists": True}}, SEARCH_INDEX_PROJECTION)
+    async for doc in cursor.batch_size(SEARCH_INDEX_SCAN_BATCH):
+        new_index.add(doc)
+        new_autocomplete.add(doc)
+    new_autocomplete.refresh()
+    service_index, autocomplete_index = new_index, new_autocomplete
+    catalog_generation += 1
+    services_cache.clear()
+    # A write landed mid-scan and may be missing, so the next request rebuilds again
+    service_index_built_at = time.monotonic() if version == service_index_version else 0.0
+
+def log_rebuild_failure(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Search index rebuild failed", exc_info=task.exception())
+
+def start_service_index_rebuild() -> asyncio.Task:
+    global service_index_rebuild
+    if service_index_rebuild is None or service_index_rebuild.done():
+        service_index_rebuild = asyncio.ensure_future(rebuild_service_index())
+        service_index_rebuild.add_done_callback(log_rebuild_failure)
+    return service_index_rebuild
+
+async def get_service_index() -> ServiceSearchIndex:
+    """
+    Return the in-process search index. Once it is older than SEARCH_INDEX_TTL_SECONDS
+    or a write invalidated it, a rebuild starts in the background and requests keep
+    using the current index until the new one is swapped in. Only a process that
+    has no index yet waits for the build.
+    """
+    if service_index is None:
+        # shield: a cancelled request must not cancel the build the others wait on
+        await asyncio.shield(start_service_index_rebuild())
+    elif time.monotonic() - service_index_built_at >= SEARCH_INDEX_TTL_SECONDS:
+        start_service_index_rebuild()
+    return service_index
+
+async def get_autocomplete_index() -> AutocompleteIndex:
+    """
+    Built from the same catalog scan as the search index, so it is refreshed on the
+    same schedule and by the same invalidate_service_catalog() after writes.
+    """
+    await get_service_index()
+    return autocomplete_index
+
+# --- Services response cache ---
+SERVICES_CACHE_TTL_SECONDS = float(os.environ.get("SERVICES_CACHE_TTL_SECONDS", "30"))
+SERVICES_CACHE_MAX_ENTRIES = int(os.environ.get("SERVICES_CACHE_MAX_ENTRIES", "512"))
+
+services_cache = TTLCache(maxsize=SERVICES_CACHE_MAX_ENTRIES, ttl=SERVICES_CACHE_TTL_SECONDS)
+catalog_generation = 0
+
+def invalidate_service_catalog():
+    """
+    Call after any write to `services` so the next read sees it.
+    """
+    global service_index_built_at, service_index_version, catalog_generation
+    service_index_built_at = 0.0
+    service_index_version += 1
+    catalog_generation += 1
+    services_cache.clear()
+
+def update_service_rating(service_id: str, rating: float):
+    """
+    After a review changes a service's rating: cached lists (sorted or filtered by
+    rating) are dropped and the autocomplete weight moves in place, without the
+    catalog rescan invalidate_service_catalog() would cause.
+    """
+    global catalog_generation, service_index_version
+    catalog_generation += 1
+    services_cache.clear()
+    if service_index_rebuild is not None and not service_index_rebuild.done():
+        service_index_version += 1  # the running build may have read the old rating
+    if autocomplete_index is not None:
+        autocomplete_index.set_weight(("service", service_id), rating)
+
+# --- Backfill migration ---
+async def backfill_location_tokens(batch_size: int = 1000) -> int:
+    """
+    Store `location_tokens` on every service, for the Mongo-side location filter.
+    Safe to re-run; it rewrites every document, so it also picks up tokenizer
+    changes. Run with `python -m backend.catalog`; returns how many changed.
+    """
+    from pymongo import UpdateOne
+
+    updated = 0
+    operations = []
+    cursor = db.services.find({}, {"_id": 1, "location": 1})
+    async for doc in cursor.batch_size(batch_size):
+        operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"location_tokens": location_tokens(doc.get("location"))}}))
+        if len(operations) >= batch_size:
+            updated += (await db.services.bulk_write(operations, ordered=False)).modified_count
+            operations = []
+    if operations:
+        updated += (await db.services.bulk_write(operations, ordered=False)).modified_count
+    return updated
+
+
+if __name__ == "__main__":
+    print(f"Updated location_tokens on {asyncio.run(backfill_location_tokens())} services")
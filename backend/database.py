@@ -0,0 +1,166 @@
+import asyncio
+import os
+import logging
+from pathlib import Path
+from typing import Optional
+from dotenv import load_dotenv
+
+load_dotenv(Path(__file__).parent / ".env")
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Serverless mode: don't connect or build indexes at startup, open the client on first
+# query instead. Indexes are then built by the first write that needs them (indexes_ready()).
+# `python -m backend.database` builds them ahead of a deploy.
+FAST_START = os.environ.get("FAST_START", "true" if os.environ.get("VERCEL") else "false").lower() == "true"
+
+
+def _env_int(name: str, default=None):
+    value = os.environ.get(name)
+    return int(value) if value not in (None, "") else default
+
+
+# --- Pool / client settings ---
+def client_options() -> dict:
+    options = {
+        "maxPoolSize": _env_int("MONGO_MAX_POOL_SIZE", 100),
+        "minPoolSize": _env_int("MONGO_MIN_POOL_SIZE", 0),
+        "maxIdleTimeMS": _env_int("MONGO_MAX_IDLE_TIME_MS"),
+        "connectTimeoutMS": _env_int("MONGO_CONNECT_TIMEOUT_MS", 10000),
+        "serverSelectionTimeoutMS": _env_int("MONGO_SERVER_SELECTION_TIMEOUT_MS", 10000),
+        "socketTimeoutMS": _env_int("MONGO_SOCKET_TIMEOUT_MS"),
+        "waitQueueTimeoutMS": _env_int("MONGO_WAIT_QUEUE_TIMEOUT_MS"),
+        "readPreference": os.environ.get("MONGO_READ_PREFERENCE", "primary"),
+    }
+    write_concern = os.environ.get("MONGO_WRITE_CONCERN")
+    if write_concern:
+        options["w"] = int(write_concern) if write_concern.isdigit() else write_concern
+    if os.environ.get("MONGO_JOURNAL"):
+        options["journal"] = os.environ["MONGO_JOURNAL"].lower() == "true"
+    return {k: v for k, v in options.items() if v is not None}
+
+
+_client = None
+_index_builders = []
+_indexes_task: Optional[asyncio.Future] = None
+
+
+# --- Client lifecycle ---
+def get_client():
+    """
+    The one client shared by every router. Normally opened by the app lifespan;
+    created here on first use for scripts and hosts that skip lifespan events.
+    motor/pymongo are imported here rather than at module load to keep cold starts short.
+    """
+    global _client
+    if _client is None:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        from backend.db_monitoring import command_listener, pool_listener
+
+        mongo_url = os.environ.get("MONGO_URL")
+        if not mongo_url or not os.environ.get("DB_NAME"):
+            raise RuntimeError("MONGO_URL and DB_NAME must be set in Vercel")
+        _client = AsyncIOMotorClient(mongo_url, event_listeners=[pool_listener, command_listener], **client_options())
+    return _client
+
+
+def get_database():
+    return get_client()[os.environ["DB_NAME"]]
+
+
+class _Database:
+    """
+    Module-level stand-in for the database so `db.users.find_one(...)` keeps working
+    without binding the client at import time.
+    """
+
+    def __getattr__(self, name):
+        return getattr(get_database(), name)
+
+    def __getitem__(self, name):
+        return get_database()[name]
+
+
+db = _Database()
+
+
+def register_indexes(builder):
+    """
+    Decorator for async functions that create a collection's indexes; all of them
+    run once when the app starts.
+    """
+    _index_builders.append(builder)
+    return builder
+
+
+async def ensure_indexes():
+    for builder in _index_builders:
+        await builder()
+
+
+async def indexes_ready():
+    """
+    Build every registered index once per process. Writes that rely on a unique index
+    for correctness (one booking per slot, one payment per idempotency key, one review
+    per user) await this first, so under FAST_START the first of them builds the
+    indexes; after that it returns at once. A failure is raised to that write and
+    the next call tries again.
+    """
+    global _indexes_task
+    if _indexes_task is None or _indexes_task.cancelled() or (_indexes_task.done() and _indexes_task.exception()):
+        _indexes_task = asyncio.ensure_future(ensure_indexes())
+    # shield: a cancelled request must not cancel the build other writes wait on
+    await asyncio.shield(_indexes_task)
+
+
+async def connect():
+    if FAST_START:
+        return
+    get_client()
+    await indexes_ready()
+
+
+def close():
+    global _client, _indexes_task
+    if _client is not None:
+        _client.close()
+        _client = None
+    _indexes_task = None
+
+
+# Server error code for transactions on a standalone mongod
+TRANSACTIONS_UNSUPPORTED = 20
+
+
+async def in_transaction(operation):
+    """
+    Run `operation(session)` in a transaction, retried on transient errors, and return
+    its result. A standalone mongod has no transactions; there it runs once with
+    session=None, so its writes are not atomic.
+    """
+    from pymongo.errors import OperationFailure
+
+    try:
+        async with await get_client().start_session() as session:
+            return await session.with_transaction(operation)
+    except OperationFailure as e:
+        if e.code != TRANSACTIONS_UNSUPPORTED:
+            raise
+    return await operation(None)
+
+
+def pool_stats() -> dict:
+    from backend.db_monitoring import pool_listener
+    stats = pool_listener.snapshot()
+    stats["max_pool_size"] = client_options()["maxPoolSize"]
+    return stats
+
+
+if __name__ == "__main__":
+    import asyncio
+    import backend.server  # noqa: F401  (registers every router's index builders)
+    from backend import database
+
+    asyncio.run(database.ensure_indexes())
+    print(f"Ran {len(database._index_builders)} index builders")
@@ -0,0 +1,103 @@
+import threading
+import time
+from pymongo import monitoring
+from backend.metrics import mongo_command_duration, mongo_pool_wait
+
+
+# Pool stats that only ever grow; the rest are current levels
+POOL_COUNTERS = ("connections_created", "connections_closed", "checkouts", "checkout_failures", "pool_clears")
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """
+    Counts connection pool events; pymongo calls these from its own threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats = {
+            "connections_created": 0,
+            "connections_closed": 0,
+            "connections_open": 0,
+            "checked_out": 0,
+            "checkouts": 0,
+            "checkout_failures": 0,
+            "pool_clears": 0,
+        }
+        self._checkout_started = {}
+
+    def _bump(self, **deltas):
+        with self._lock:
+            for key, delta in deltas.items():
+                self.stats[key] += delta
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self.stats)
+
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_closed(self, event): pass
+    def connection_ready(self, event): pass
+
+    # Checkout start and finish happen on the same driver thread, so the wait time
+    # is tracked per thread (pymongo 4.5 events don't carry a duration yet).
+    def connection_check_out_started(self, event):
+        self._checkout_started[threading.get_ident()] = time.perf_counter()
+
+    def _observe_wait(self, outcome: str):
+        started = self._checkout_started.pop(threading.get_ident(), None)
+        if started is not None:
+            mongo_pool_wait.observe((outcome,), time.perf_counter() - started)
+
+    def pool_cleared(self, event):
+        self._bump(pool_clears=1)
+
+    def connection_created(self, event):
+        self._bump(connections_created=1, connections_open=1)
+
+    def connection_closed(self, event):
+        self._bump(connections_closed=1, connections_open=-1)
+
+    def connection_check_out_failed(self, event):
+        self._observe_wait("failed")
+        self._bump(checkout_failures=1)
+
+    def connection_checked_out(self, event):
+        self._observe_wait("ok")
+        self._bump(checkouts=1, checked_out=1)
+
+    def connection_checked_in(self, event):
+        self._bump(checked_out=-1)
+
+
+class CommandTimingListener(monitoring.CommandListener):
+    """
+    Feeds command durations into mongodb_command_duration_seconds, tagged by
+    collection and command name. Only started events carry the command body, so the
+    collection is remembered per (connection, request id) until the reply arrives.
+    """
+
+    def __init__(self):
+        self._collections = {}
+
+    def started(self, event):
+        value = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            value = event.command.get("collection")
+        collection = value if isinstance(value, str) else "-"
+        self._collections[(event.connection_id, event.request_id)] = collection
+
+    def _observe(self, event, outcome: str):
+        collection = self._collections.pop((event.connection_id, event.request_id), "-")
+        mongo_command_duration.observe((collection, event.command_name, outcome), event.duration_micros / 1e6)
+
+    def succeeded(self, event):
+        self._observe(event, "ok")
+
+    def failed(self, event):
+        self._observe(event, "failed")
+
+
+pool_listener = PoolStatsListener()
+command_listener = CommandTimingListener()
@@ -0,0 +1,143 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from datetime import datetime, date, timedelta
+from typing import Optional
+import csv
+import io
+import json
+from backend.auth import get_admin_user
+from backend.database import db
+from backend.models import User
+from backend.serializers import serialize_mongo_document, json_serialize
+
+router = APIRouter(prefix="/api")
+
+EXPORT_DEFAULT_BATCH_SIZE = 1000
+EXPORT_MAX_BATCH_SIZE = 10000
+
+# --- Exportable collections ---
+# fields: default column set (and CSV header); filters: query params matched exactly;
+# date_field: what ?date_from= / ?date_to= apply to. Services keep their own `id`, so `_id` is dropped.
+EXPORTS = {
+    "services": {
+        "fields": ["id", "name", "category", "description", "price_range", "min_price", "max_price", "price_unit", "location", "rating",
+                   "image_url", "contact_phone", "contact_email", "availability", "geo", "created_at"],
+        "filters": ["category", "location", "availability"],
+        "date_field": "created_at",
+        "keep_object_id": False,
+    },
+    "appointments": {
+        "fields": ["id", "user_email", "service_id", "appointment_date", "payment_id", "booking_group", "status", "created_at"],
+        "filters": ["service_id", "user_email", "status", "payment_id"],
+        "date_field": "appointment_date",
+        "keep_object_id": True,
+    },
+    "payments": {
+        "fields": ["id", "payment_id", "email", "user_id", "service_id", "amount", "currency", "status", "timestamp"],
+        "filters": ["payment_id", "email", "user_id", "service_id", "status", "currency"],
+        "date_field": "timestamp",
+        "keep_object_id": True,
+    },
+}
+
+
+def parse_filter_value(value: str):
+    if value in ("true", "false"):
+        return value == "true"
+    return value
+
+
+def build_export_query(config: dict, request: Request, date_from: Optional[str], date_to: Optional[str]) -> dict:
+    query = {}
+    for name in config["filters"]:
+        if name in request.query_params:
+            query[name] = parse_filter_value(request.query_params[name])
+    date_range = {}
+    try:
+        if date_from:
+            date_range["$gte"] = datetime.combine(date.fromisoformat(date_from), datetime.min.time())
+        if date_to:
+            date_range["$lt"] = datetime.combine(date.fromisoformat(date_to) + timedelta(days=1), datetime.min.time())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="date_from and date_to must be YYYY-MM-DD dates")
+    if date_range:
+        query[config["date_field"]] = date_range
+    return query
+
+
+def export_document(doc: dict, keep_object_id: bool) -> dict:
+    if not keep_object_id:
+        doc.pop("_id", None)
+    return {k: json_serialize(v) for k, v in serialize_mongo_document(doc).items()}
+
+
+async def stream_export(cursor, fields, fmt: str, keep_object_id: bool, batch_size: int):
+    """
+    Yield the export one cursor batch at a time, so memory stays flat however large
+    the collection is.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer:
+        writer.writerow(fields)
+    pending = 0
+    async for doc in cursor:
+        row = export_document(doc, keep_object_id)
+        if writer:
+            writer.writerow([
+                json.dumps(row[f]) if isinstance(row.get(f), (dict, list)) else row.get(f, "")
+                for f in fields
+            ])
+        else:
+            buffer.write(json.dumps({f: row[f] for f in fields if f in row}, default=str))
+            buffer.write("\n")
+        pending += 1
+        if pending >= batch_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+@router.get("/export/{collection}")
+async def export_collection(
+    collection: str,
+    request: Request,
+    format: str = "ndjson",
+    fields: Optional[str] = None,
+    batch_size: int = EXPORT_DEFAULT_BATCH_SIZE,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    admin: User = Depends(get_admin_user)
+):
+    """
+    Stream a full dump of services, appointments or payments as NDJSON or CSV.
+    Supports exact-match filters (see EXPORTS), a `date_from`/`date_to` range,
+    and `fields` to project a comma-separated subset of columns.
+    """
+    config = EXPORTS.get(collection)
+    if not config:
+        raise HTTPException(status_code=404, detail=f"Unknown export '{collection}'")
+    if format not in ("ndjson", "csv"):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'csv'")
+    if not 1 <= batch_size <= EXPORT_MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"batch_size must be 1-{EXPORT_MAX_BATCH_SIZE}")
+
+    selected = [f.strip() for f in fields.split(",") if f.strip()] if fields else config["fields"]
+    query = build_export_query(config, request, date_from, date_to)
+
+    # `id` of appointments/payments comes from `_id`, everything else is a real field
+    projection = {f: 1 for f in selected if not (f == "id" and config["keep_object_id"])}
+    if not config["keep_object_id"] or "id" not in selected:
+        projection["_id"] = 0
+    cursor = db[collection].find(query, projection).sort("_id", 1).batch_size(batch_size)
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"{collection}-{datetime.utcnow():%Y%m%d%H%M%S}.{'csv' if format == 'csv' else 'ndjson'}"
+    return StreamingResponse(
+        stream_export(cursor, selected, format, config["keep_object_id"], batch_size),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,157 @@
+import asyncio
+import os
+import time
+from bisect import bisect_right
+from collections import Counter
+from typing import Optional
+from backend.database import db
+
+# --- Facet buckets ---
+# Lower bounds; a value falls in [bounds[i], bounds[i + 1]) and the last bucket is open-ended
+RATING_BOUNDS = [0, 3, 3.5, 4, 4.5]
+PRICE_BOUNDS = [0, 100, 500, 1000, 5000, 10000, 50000]
+BUCKET_CEILING = 1e12
+OTHER_BUCKET = "other"  # missing / non-numeric values
+FACET_MAX_LOCATIONS = 50
+FACET_FIELDS_PROJECTION = {"_id": 0, "category": 1, "location": 1, "rating": 1, "min_price": 1}
+FACET_CACHE_REFRESH_SECONDS = float(os.environ.get("FACET_CACHE_REFRESH_SECONDS", "600"))
+
+
+def facet_pipeline(query: dict) -> list:
+    """
+    Every facet in one round trip. With the (availability, category, location, rating,
+    min_price) index the $match + $project run as a covered index scan.
+    """
+    def bucket(field, bounds):
+        return [{"$bucket": {"groupBy": f"${field}", "boundaries": bounds + [BUCKET_CEILING], "default": OTHER_BUCKET}}]
+
+    return [
+        {"$match": query},
+        {"$project": FACET_FIELDS_PROJECTION},
+        {"$facet": {
+            "total": [{"$count": "count"}],
+            "category": [{"$sortByCount": "$category"}],
+            "location": [{"$sortByCount": "$location"}],
+            "rating": bucket("rating", RATING_BOUNDS),
+            "price": bucket("min_price", PRICE_BOUNDS),
+        }},
+    ]
+
+
+def bucket_of(value, bounds):
+    if not isinstance(value, (int, float)) or isinstance(value, bool) or value < bounds[0]:
+        return None
+    return bounds[bisect_right(bounds, value) - 1]
+
+
+def empty_counts() -> dict:
+    return {"total": 0, "category": Counter(), "location": Counter(), "rating": Counter(), "price": Counter()}
+
+
+def counts_from_aggregation(raw: dict) -> dict:
+    counts = empty_counts()
+    counts["total"] = raw["total"][0]["count"] if raw["total"] else 0
+    for name in ("category", "location"):
+        for row in raw[name]:
+            counts[name][row["_id"]] = row["count"]
+    for name in ("rating", "price"):
+        for row in raw[name]:
+            counts[name][None if row["_id"] == OTHER_BUCKET else row["_id"]] = row["count"]
+    return counts
+
+
+def sum_counts(parts) -> dict:
+    """
+    Counts of disjoint sets of services (one aggregation per chunk of ids) added up.
+    """
+    counts = empty_counts()
+    for part in parts:
+        counts["total"] += part["total"]
+        for name in ("category", "location", "rating", "price"):
+            counts[name].update(part[name])
+    return counts
+
+
+def format_counts(counts: dict) -> dict:
+    def values(counter, limit=None):
+        ranked = sorted(((v, n) for v, n in counter.items() if n > 0), key=lambda item: (-item[1], str(item[0])))
+        return [{"value": v, "count": n} for v, n in ranked[:limit]]
+
+    def buckets(counter, bounds):
+        rows = [
+            {"min": low, "max": bounds[i + 1] if i + 1 < len(bounds) else None, "count": counter.get(low, 0)}
+            for i, low in enumerate(bounds)
+        ]
+        if counter.get(None):
+            rows.append({"min": None, "max": None, "count": counter[None]})
+        return rows
+
+    return {
+        "total": counts["total"],
+        "category": values(counts["category"]),
+        "location": values(counts["location"], FACET_MAX_LOCATIONS),
+        "rating": buckets(counts["rating"], RATING_BOUNDS),
+        "price": buckets(counts["price"], PRICE_BOUNDS),
+    }
+
+
+async def aggregate_facets(query: dict) -> dict:
+    results = await db.services.aggregate(facet_pipeline(query)).to_list(1)
+    return counts_from_aggregation(results[0])
+
+
+class MaterializedFacets:
+    """
+    Facet counts of the unfiltered catalog (available services), kept in memory and
+    adjusted by apply() on each service write instead of re-aggregating. A periodic
+    full rebuild corrects anything a bulk write or another worker changed.
+    """
+
+    def __init__(self):
+        self.counts: Optional[dict] = None
+        self.built_at = 0.0
+        self.version = 0
+        self._lock = asyncio.Lock()
+
+    def _adjust(self, doc: Optional[dict], step: int):
+        if not doc or not doc.get("availability", True):
+            return
+        counts = self.counts
+        counts["total"] += step
+        counts["category"][doc.get("category")] += step
+        counts["location"][doc.get("location")] += step
+        counts["rating"][bucket_of(doc.get("rating"), RATING_BOUNDS)] += step
+        counts["price"][bucket_of(doc.get("min_price"), PRICE_BOUNDS)] += step
+
+    def apply(self, before: Optional[dict], after: Optional[dict]):
+        """
+        Record one service write: `before`/`after` are the old and new documents
+        (None for an insert or a delete).
+        """
+        self.version += 1
+        if self.counts is None:
+            return
+        self._adjust(before, -1)
+        self._adjust(after, 1)
+
+    def invalidate(self):
+        """
+        For writes whose before-images aren't known (bulk imports): rebuild on next read.
+        """
+        self.version += 1
+        self.built_at = 0.0
+
+    async def get(self) -> dict:
+        if self.counts is not None and time.monotonic() - self.built_at < FACET_CACHE_REFRESH_SECONDS:
+            return self.counts
+        async with self._lock:
+            if self.counts is None or time.monotonic() - self.built_at >= FACET_CACHE_REFRESH_SECONDS:
+                version = self.version
+                counts = await aggregate_facets({"availability": True})
+                self.counts = counts
+                # A write landed mid-aggregation; its delta may be missing, so rebuild next time
+                self.built_at = time.monotonic() if version == self.version else 0.0
+        return self.counts
+
+
+service_facets = MaterializedFacets()
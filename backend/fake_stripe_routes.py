@@ -1,68 +1,190 @@
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import JSONResponse
-from datetime import datetime
-import uuid
-from motor.motor_asyncio import AsyncIOMotorClient
+from datetime import datetime, timedelta
+import logging
 import os
-from dotenv import load_dotenv
+import uuid
+from typing import Optional
 from bson import ObjectId
+from backend.database import db, indexes_ready, register_indexes
+from backend.jobs import enqueue_side_effects, job_handler
+from backend.payment_gateway import GatewayError, get_payment_gateway
+from backend.serializers import json_serialize
+
+router = APIRouter(prefix="/api", tags=["payment"])
+
+logger = logging.getLogger(__name__)
+
+# A "pending" reservation older than this is taken to be abandoned (its request crashed)
+# and a retry with the same idempotency key may take it over. Keep it above the gateway's timeout.
+PAYMENT_PENDING_LEASE_SECONDS = float(os.environ.get("PAYMENT_PENDING_LEASE_SECONDS", "60"))
+
 
-load_dotenv()
+@register_indexes
+async def ensure_payment_indexes():
+    # Only client-supplied keys are deduplicated; older payments have none
+    await db.payments.create_index(
+        "idempotency_key",
+        unique=True,
+        partialFilterExpression={"idempotency_key": {"$type": "string"}},
+        name="idempotency_key_unique",
+    )
+    await db.payments.create_index("payment_id")
 
-router = APIRouter(prefix="/api/payment", tags=["payment"])
-router = APIRouter(prefix="/api")
 
-# Connect to MongoDB
-client = AsyncIOMotorClient(os.getenv("MONGO_URL"))
-db = client[os.getenv("DB_NAME")]
+@job_handler("payments.succeeded")
+async def send_receipt(payload: dict):
+    """
+    Receipt for a successful payment. There is no mail provider yet, so it is logged.
+    """
+    payment = await db.payments.find_one({"payment_id": payload["payment_id"]}, {"_id": 0})
+    if payment is None:
+        return
+    logger.info(
+        "Receipt to %s: %.2f %s for %s (payment %s)",
+        payment["email"], payment["amount"], payment["currency"], payment["service_id"], payment["payment_id"],
+    )
+
+
+def payment_response(payment: dict, replayed: bool = False) -> JSONResponse:
+    response_payment = {k: json_serialize(v) for k, v in payment.items()}
+    if payment["status"] == "success":
+        body = {"status": "success", "message": "Payment successful (simulated)", "payment": response_payment}
+        status_code = 200
+    else:
+        body = {"status": "failed", "message": "Payment declined", "payment": response_payment}
+        status_code = 402
+    headers = {"Idempotent-Replayed": "true"} if replayed else None
+    return JSONResponse(body, status_code=status_code, headers=headers)
+
+
+async def release_reservation(payment_id: ObjectId):
+    """
+    Drop a reservation that never got an outcome, so a retry with the same key can
+    charge again (the gateway itself is idempotent on the key).
+    """
+    try:
+        await db.payments.delete_one({"_id": payment_id, "status": "pending"})
+    except Exception:
+        # Mongo is unreachable too; the reservation's lease lets a retry reclaim it later
+        logger.exception("Could not release payment reservation %s", payment_id)
+
+
+async def replay_payment(idempotency_key: str, amount: float) -> Optional[JSONResponse]:
+    """
+    The stored result for a reused idempotency key. Returns None when the key's
+    reservation was abandoned and has just been released, so the caller can retry.
+    """
+    existing = await db.payments.find_one({"idempotency_key": idempotency_key})
+    if existing is None:
+        # The reservation was released between our insert and this read; let the client retry
+        raise HTTPException(status_code=409, detail="Payment with this idempotency key is being retried")
+    if existing["amount"] != amount:
+        raise HTTPException(status_code=422, detail="Idempotency key was already used with a different amount")
+    if existing["status"] == "pending":
+        now = datetime.utcnow()
+        # Reservations from before leases existed fall back to their timestamp
+        stale = await db.payments.delete_one({
+            "_id": existing["_id"],
+            "status": "pending",
+            "$or": [
+                {"lease_expires_at": {"$lte": now}},
+                {"lease_expires_at": {"$exists": False}, "timestamp": {"$lte": now - timedelta(seconds=PAYMENT_PENDING_LEASE_SECONDS)}},
+            ],
+        })
+        if stale.deleted_count:
+            return None
+        raise HTTPException(status_code=409, detail="Payment with this idempotency key is in progress")
+    return payment_response(existing, replayed=True)
 
-# Custom JSON serializer
-def json_serialize(obj):
-    if isinstance(obj, ObjectId):
-        return str(obj)
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-    return obj
 
 @router.post("/create-fake-payment")
 async def create_fake_payment(request: Request):
     """
-    Simulate a Stripe payment and store it in MongoDB.
+    Charge through the configured gateway (the local simulator by default) and store
+    the payment in MongoDB. Retries carrying the same `Idempotency-Key` header (or
+    `idempotency_key` field) replay the stored result instead of charging again.
     """
+    from pymongo.errors import DuplicateKeyError
+
     try:
         data = await request.json()
         amount = data.get("amount")
         if amount is None or not isinstance(amount, (int, float)):
             raise HTTPException(status_code=400, detail="Invalid amount")
+        amount = float(amount)
 
         user_email = data.get("email", "guest@example.com")
         user_id = data.get("user_id", "guest_user")
         service_id = data.get("service_id", "unknown_service")
+        idempotency_key = request.headers.get("idempotency-key") or data.get("idempotency_key")
 
+        now = datetime.utcnow()
         fake_payment = {
             "_id": ObjectId(),
             "payment_id": str(uuid.uuid4()),
             "email": user_email,
             "user_id": user_id,
             "service_id": service_id,
-            "amount": float(amount),
+            "amount": amount,
             "currency": "INR",
-            "status": "success",
-            "timestamp": datetime.utcnow(),
+            "status": "pending",
+            "timestamp": now,
+            "lease_expires_at": now + timedelta(seconds=PAYMENT_PENDING_LEASE_SECONDS),
         }
+        if idempotency_key:
+            fake_payment["idempotency_key"] = idempotency_key
 
-        # Save to MongoDB
-        await db.payments.insert_one(fake_payment)
+        # ✅ Reserve the key first; the unique index makes concurrent retries lose here
+        await indexes_ready()
+        for attempt in range(2):
+            try:
+                await db.payments.insert_one(fake_payment)
+                break
+            except DuplicateKeyError:
+                replayed = await replay_payment(idempotency_key, amount)
+                if replayed is not None:
+                    return replayed
+                # An abandoned reservation was just released; take the key over once
+                if attempt:
+                    raise HTTPException(status_code=409, detail="Payment with this idempotency key is being retried")
 
-        # Serialize for response
-        response_payment = {k: json_serialize(v) for k, v in fake_payment.items()}
+        gateway = get_payment_gateway()
+        recorded = False
+        try:
+            try:
+                result = await gateway.charge(
+                    amount,
+                    fake_payment["currency"],
+                    idempotency_key or fake_payment["payment_id"],
+                    {"payment_id": fake_payment["payment_id"], "service_id": service_id, "email": user_email},
+                )
+            except GatewayError as e:
+                raise HTTPException(status_code=503, detail=f"Payment gateway unavailable: {e}", headers={"Retry-After": "1"})
+
+            outcome = {
+                "status": "success" if result.status == "success" else "failed",
+                "gateway": gateway.name,
+                "gateway_reference": result.gateway_reference,
+            }
+            if result.failure_reason:
+                outcome["failure_reason"] = result.failure_reason
+            await db.payments.update_one(
+                {"_id": fake_payment["_id"]}, {"$set": outcome, "$unset": {"lease_expires_at": ""}}
+            )
+            recorded = True
+        finally:
+            if not recorded:
+                # Outcome unknown or unsaved (gateway error, crash, cancelled request): free the
+                # key so a retry can go through to the (idempotent) gateway
+                await release_reservation(fake_payment["_id"])
+        fake_payment.update(outcome)
+        fake_payment.pop("lease_expires_at")
+        if outcome["status"] == "success":
+            await enqueue_side_effects("payments.succeeded", {"payment_id": fake_payment["payment_id"]})
 
         # ✅ Return "status": "success" at the top level too
-        return JSONResponse({
-            "status": "success",
-            "message": "Payment successful (simulated)",
-            "payment": response_payment
-        })
+        return payment_response(fake_payment)
 
     except HTTPException as e:
         raise e
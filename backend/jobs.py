@@ -0,0 +1,211 @@
+import asyncio
+import logging
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional
+from backend.database import db, register_indexes
+
+logger = logging.getLogger(__name__)
+
+# --- Job queue config ---
+# Workers per app process; 0 leaves the jobs to `python -m backend.jobs`
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "4"))
+JOB_MAX_ATTEMPTS = int(os.environ.get("JOB_MAX_ATTEMPTS", "5"))
+# A running job whose lease runs out (its worker died) is picked up again
+JOB_LEASE_SECONDS = float(os.environ.get("JOB_LEASE_SECONDS", "60"))
+# Idle workers also look for due retries / expired leases this often
+JOB_POLL_SECONDS = float(os.environ.get("JOB_POLL_SECONDS", "5"))
+JOB_RETRY_BASE_SECONDS = 2.0
+JOB_RETRY_MAX_SECONDS = 600.0
+# Finished jobs are dropped by a TTL index after this long; failed ones are kept
+JOB_RETENTION_DAYS = float(os.environ.get("JOB_RETENTION_DAYS", "7"))
+
+_handlers: Dict[str, Callable[[dict], Awaitable]] = {}
+
+
+def job_handler(job_type: str):
+    """
+    Decorator for the async function that runs jobs of `job_type` with their payload.
+    Jobs run at least once (a worker can die after the work, before marking it done),
+    so handlers must be safe to repeat.
+    """
+    def register(handler):
+        _handlers[job_type] = handler
+        return handler
+    return register
+
+
+def retry_delay(attempts: int) -> float:
+    # Exponential backoff; the jitter keeps jobs that failed together from retrying together
+    delay = min(JOB_RETRY_MAX_SECONDS, JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+@register_indexes
+async def ensure_job_indexes():
+    # Claims look for the earliest due job; `run_at` is the lease deadline while running
+    await db.jobs.create_index([("status", 1), ("run_at", 1)])
+    await db.jobs.create_index("expires_at", expireAfterSeconds=0)
+
+
+class JobQueue:
+    """
+    Durable background jobs. enqueue() is a single insert into `jobs`; a bounded pool
+    of workers claims due jobs with an atomic find_one_and_update that also takes a
+    lease, so any number of processes can share the collection. Failures are retried
+    with exponential backoff until `max_attempts`, then the job stays "failed" with
+    its last error. Jobs live in Mongo and survive restarts.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS):
+        self.workers = workers
+        self._tasks = []
+        self._wake: Optional[asyncio.Event] = None
+        self._stopping = False
+
+    async def enqueue(self, job_type: str, payload: dict, delay_seconds: float = 0,
+                      max_attempts: int = JOB_MAX_ATTEMPTS):
+        now = datetime.utcnow()
+        result = await db.jobs.insert_one({
+            "type": job_type,
+            "payload": payload,
+            "status": "queued",
+            "attempts": 0,
+            "max_attempts": max_attempts,
+            "run_at": now + timedelta(seconds=delay_seconds),
+            "created_at": now,
+        })
+        if self._wake is not None:
+            self._wake.set()  # ✅ a local idle worker starts now instead of at its next poll
+        return result.inserted_id
+
+    def start(self):
+        if self._tasks:
+            return
+        self._stopping = False
+        self._wake = asyncio.Event()
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self, grace_seconds: float = 10.0):
+        """
+        Let running jobs finish for up to `grace_seconds`; any still running after
+        that are cancelled and rerun elsewhere once their lease expires.
+        """
+        self._stopping = True
+        if self._wake is not None:
+            self._wake.set()
+        if not self._tasks:
+            return
+        _, pending = await asyncio.wait(self._tasks, timeout=grace_seconds)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks = []
+
+    async def claim(self) -> Optional[dict]:
+        from pymongo import ReturnDocument
+
+        now = datetime.utcnow()
+        return await db.jobs.find_one_and_update(
+            {
+                "status": {"$in": ["queued", "running"]},
+                "run_at": {"$lte": now},
+                # An expired lease with no attempts left is failed by fail_exhausted() instead
+                "$expr": {"$lt": ["$attempts", "$max_attempts"]},
+            },
+            {
+                "$set": {"status": "running", "run_at": now + timedelta(seconds=JOB_LEASE_SECONDS)},
+                "$inc": {"attempts": 1},
+            },
+            sort=[("run_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def fail_exhausted(self):
+        """
+        Jobs whose lease ran out on their last attempt: the worker died running them,
+        likely because of the job itself, so they are not retried again.
+        """
+        now = datetime.utcnow()
+        result = await db.jobs.update_many(
+            {"status": "running", "run_at": {"$lte": now}, "$expr": {"$gte": ["$attempts", "$max_attempts"]}},
+            {"$set": {"status": "failed", "finished_at": now, "last_error": "Lease expired on the last attempt"}},
+        )
+        if result.modified_count:
+            logger.error("%d jobs failed for good after their worker died on the last attempt", result.modified_count)
+
+    async def run(self, job: dict):
+        handler = _handlers.get(job["type"])
+        try:
+            if handler is None:
+                raise LookupError(f"No handler for job type {job['type']!r}")
+            await asyncio.wait_for(handler(job["payload"]), JOB_LEASE_SECONDS)
+        except Exception as e:
+            await self._failed(job, e)
+            return
+        now = datetime.utcnow()
+        # Matching `attempts` ignores a job that was already re-claimed after its lease ran out
+        await db.jobs.update_one(
+            {"_id": job["_id"], "attempts": job["attempts"]},
+            {"$set": {"status": "done", "finished_at": now, "expires_at": now + timedelta(days=JOB_RETENTION_DAYS)}},
+        )
+
+    async def _failed(self, job: dict, error: Exception):
+        now = datetime.utcnow()
+        attempts = job["attempts"]
+        update = {"last_error": f"{type(error).__name__}: {error}"}
+        if attempts >= job.get("max_attempts", JOB_MAX_ATTEMPTS):
+            logger.error("Job %s (%s) failed for good after %d attempts: %s", job["_id"], job["type"], attempts, error)
+            update.update(status="failed", finished_at=now)
+        else:
+            delay = retry_delay(attempts)
+            logger.warning("Job %s (%s) failed, retrying in %.0fs: %s", job["_id"], job["type"], delay, error)
+            update.update(status="queued", run_at=now + timedelta(seconds=delay))
+        await db.jobs.update_one({"_id": job["_id"], "attempts": attempts}, {"$set": update})
+
+    async def _worker(self):
+        while not self._stopping:
+            # Cleared before claiming, so an enqueue during the claim still wakes us below
+            self._wake.clear()
+            try:
+                job = await self.claim()
+                if job is not None:
+                    await self.run(job)
+                    continue
+                await self.fail_exhausted()
+            except Exception:
+                # Mongo unreachable or similar; the job's lease brings it back later
+                logger.exception("Job worker error")
+            try:
+                await asyncio.wait_for(self._wake.wait(), JOB_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+
+job_queue = JobQueue()
+
+
+async def enqueue_side_effects(job_type: str, payload: dict):
+    """
+    Enqueue follow-up work for a write that has already succeeded. A failure here is
+    logged rather than raised, so the client still gets its booking / payment result.
+    """
+    try:
+        await job_queue.enqueue(job_type, payload)
+    except Exception:
+        logger.exception("Could not enqueue %s job", job_type)
+
+
+if __name__ == "__main__":
+    # Standalone worker for hosts where the app process can't run background tasks (FAST_START)
+    import backend.server  # noqa: F401  (registers every job handler)
+    from backend import jobs  # the imported module, where the handlers landed; not this __main__ copy
+
+    async def main():
+        jobs.job_queue.workers = max(1, jobs.JOB_WORKERS)
+        jobs.job_queue.start()
+        await asyncio.Event().wait()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,80 @@
+import asyncio
+from typing import Dict, Iterable, List, Optional
+from backend.database import db
+
+
+class BatchLoader:
+    """
+    DataLoader-style lookups by one field. Every load() issued in the same event-loop
+    tick is sent as a single `$in` query, and a load for a value that is already
+    being fetched joins that fetch instead of starting another (singleflight).
+    Nothing is cached once a fetch completes.
+    """
+
+    def __init__(self, collection: str, key: str = "id", projection: Optional[dict] = None,
+                 max_batch: int = 1000):
+        self.collection = collection
+        self.key = key
+        self.projection = projection
+        self.max_batch = max_batch
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._scheduled = False
+
+    def _future_for(self, value: str) -> asyncio.Future:
+        future = self._pending.get(value) or self._in_flight.get(value)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[value] = future
+            if not self._scheduled:
+                self._scheduled = True
+                loop.call_soon(self._dispatch)
+        return future
+
+    def _dispatch(self):
+        self._scheduled = False
+        pending, self._pending = list(self._pending.items()), {}
+        for start in range(0, len(pending), self.max_batch):
+            batch = dict(pending[start:start + self.max_batch])
+            self._in_flight.update(batch)
+            asyncio.ensure_future(self._fetch(batch))
+
+    async def _fetch(self, batch: Dict[str, asyncio.Future]):
+        try:
+            cursor = db[self.collection].find({self.key: {"$in": list(batch)}}, self.projection)
+            found = {}
+            async for doc in cursor:
+                found.setdefault(doc[self.key], doc)
+            for value, future in batch.items():
+                if not future.done():
+                    future.set_result(found.get(value))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            for value, future in batch.items():
+                if self._in_flight.get(value) is future:
+                    del self._in_flight[value]
+
+    async def load(self, value: str):
+        # shield: one caller being cancelled must not cancel the fetch the others share
+        result = await asyncio.shield(self._future_for(value))
+        # Waiters share the fetched document, so each gets its own copy
+        return dict(result) if result is not None else None
+
+    async def load_many(self, values: Iterable[str]) -> List:
+        return list(await asyncio.gather(*(self.load(value) for value in values)))
+
+    def forget(self, value: str):
+        """
+        After a write: later loads of `value` start a new fetch instead of joining
+        one that may have read the old document.
+        """
+        self._in_flight.pop(value, None)
+
+
+# --- Shared loaders ---
+users_by_id = BatchLoader("users", projection={"_id": 0, "password": 0})
+services_by_id = BatchLoader("services", projection={"_id": 0})
@@ -0,0 +1,133 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+# Seconds; tuned for API handlers and Mongo commands (0.5 ms .. 10 s)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Seconds a server-sent events connection stays open (1 s .. 1 h)
+STREAM_BUCKETS = (1.0, 10.0, 30.0, 60.0, 300.0, 900.0, 1800.0, 3600.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Histogram:
+    """
+    Minimal Prometheus histogram. Safe to observe from pymongo's monitoring threads;
+    the lock is only held for a bisect and three increments.
+    """
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...], buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._series: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float):
+        position = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # [per-bucket counts..., +Inf count, sum]
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[position] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+        for labels, series in sorted(snapshot.items()):
+            label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.labelnames, labels))
+            prefix = f"{label_text}," if label_text else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            cumulative += series[len(self.buckets)]
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {cumulative}')
+            suffix = f"{{{label_text}}}" if label_text else ""
+            lines.append(f"{self.name}_sum{suffix} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+# --- Metrics ---
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template and status.",
+    ("method", "route", "status"),
+)
+http_stream_duration = Histogram(
+    "http_stream_duration_seconds", "How long server-sent event streams stay connected, by route template.",
+    ("method", "route", "status"), buckets=STREAM_BUCKETS,
+)
+mongo_command_duration = Histogram(
+    "mongodb_command_duration_seconds", "MongoDB command latency by collection and command.",
+    ("collection", "command", "outcome"),
+)
+mongo_pool_wait = Histogram(
+    "mongodb_pool_wait_seconds", "Time spent waiting to check a connection out of the pool.",
+    ("outcome",),
+)
+HISTOGRAMS = [http_request_duration, http_stream_duration, mongo_command_duration, mongo_pool_wait]
+
+
+def render_metrics(gauges: Dict[str, float] = None, counters: Dict[str, float] = None) -> str:
+    """
+    Histograms plus extra values: `gauges` are point-in-time readings, `counters` only
+    ever grow (rendered with the `_total` suffix so rate() treats them right).
+    """
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    for name, value in (gauges or {}).items():
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value}")
+    for name, value in (counters or {}).items():
+        lines.append(f"# TYPE {name}_total counter")
+        lines.append(f"{name}_total {value}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware overhead) that times every HTTP
+    request and labels it with the matched route template, e.g. /api/chat/{service_id}.
+    Event streams last as long as the client stays connected, so they go into their
+    own histogram instead of skewing request latency.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_holder = [500]
+        histogram_holder = [http_request_duration]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder[0] = message["status"]
+                for name, value in message.get("headers", ()):
+                    if name.lower() == b"content-type" and value.startswith(b"text/event-stream"):
+                        histogram_holder[0] = http_stream_duration
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            # Unmatched paths share one label so scanners can't blow up cardinality
+            template = getattr(route, "path", None) or "unmatched"
+            histogram_holder[0].observe(
+                (scope["method"], template, str(status_holder[0])),
+                time.perf_counter() - started,
+            )
@@ -0,0 +1,122 @@
+from pydantic import BaseModel, Field, field_validator, model_validator
+from datetime import date, datetime
+from enum import Enum
+from typing import List, Literal, Optional
+import uuid
+from backend.pricing import parse_price_range
+
+# --- Service Categories ---
+class ServiceCategory(str, Enum):
+    VENUE = "venues"
+    CATERING = "catering"
+    DECORATION = "decoration"
+    PHOTOGRAPHY = "photography"
+    MAKEUP = "makeup"
+    DJ = "dj"
+    TRANSPORT = "transport"
+    GIFTS = "gifts"
+
+# --- Models ---
+class User(BaseModel): 
+    id: str = Field(default_factory=lambda: str(uuid.uuid4())) 
+    name: str 
+    email: str 
+    phone: str | None = None 
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+class UserRegister(BaseModel):
+    name: str
+    email: str
+    password: str
+    phone: str | None = None
+
+class UserLogin(BaseModel):
+    email: str
+    password: str
+
+class GeoPoint(BaseModel):
+    """
+    GeoJSON point as stored for the 2dsphere index; coordinates are [lng, lat].
+    """
+    type: Literal["Point"] = "Point"
+    coordinates: List[float]
+
+    @field_validator("coordinates")
+    @classmethod
+    def check_coordinates(cls, value):
+        if len(value) != 2 or not (-180 <= value[0] <= 180 and -90 <= value[1] <= 90):
+            raise ValueError("coordinates must be [lng, lat] within range")
+        return value
+
+class Service(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    name: str
+    category: ServiceCategory
+    description: str
+    price_range: str
+    # Parsed from price_range so budgets can be filtered and sorted in Mongo
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    price_unit: Optional[str] = None
+    location: str
+    rating: float = 4.0
+    review_count: int = 0
+    image_url: str
+    contact_phone: str
+    contact_email: str
+    availability: bool = True
+    geo: Optional[GeoPoint] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    @model_validator(mode="before")
+    @classmethod
+    def geo_from_lat_lng(cls, data):
+        # Flat `lat`/`lng` columns (CSV imports) become the GeoJSON point
+        if isinstance(data, dict) and data.get("geo") is None and "lat" in data and "lng" in data:
+            lat, lng = data["lat"], data["lng"]
+            data = {k: v for k, v in data.items() if k not in ("lat", "lng")}
+            try:
+                data["geo"] = {"type": "Point", "coordinates": [float(lng), float(lat)]}
+            except (TypeError, ValueError):
+                raise ValueError("lat and lng must be numbers")
+        return data
+
+    @model_validator(mode="after")
+    def fill_prices(self):
+        if self.min_price is None and self.price_unit is None:
+            self.min_price, self.max_price, self.price_unit = parse_price_range(self.price_range)
+        return self
+
+class ServiceNearby(Service):
+    distance_km: float
+
+class ReviewCreate(BaseModel):
+    rating: int = Field(ge=1, le=5)
+    comment: Optional[str] = Field(default=None, max_length=2000)
+
+class Review(ReviewCreate):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    service_id: str
+    user_id: str
+    user_name: str
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: Optional[datetime] = None
+
+# Bookings made together (one payment) are capped to what one wedding plausibly needs
+BATCH_BOOKING_MAX_SLOTS = 20
+
+class BookingSlot(BaseModel):
+    service_id: str
+    appointment_date: date
+
+class BatchBookingCreate(BaseModel):
+    email: str = "guest@example.com"
+    payment_id: Optional[str] = None
+    slots: List[BookingSlot] = Field(min_length=1, max_length=BATCH_BOOKING_MAX_SLOTS)
+
+    @field_validator("slots")
+    @classmethod
+    def distinct_slots(cls, value):
+        if len({(slot.service_id, slot.appointment_date) for slot in value}) != len(value):
+            raise ValueError("each (service_id, appointment_date) slot may appear only once")
+        return value
@@ -0,0 +1,69 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Callable, Iterable, List, Sequence, Tuple
+from fastapi import HTTPException
+from backend.serializers import json_serialize
+
+# --- Keyset (cursor) pagination ---
+# A cursor is the sort key of the last item on the page, so the next page is one
+# indexed range scan however deep it is, unlike skip() which walks every skipped doc.
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(values: Sequence) -> str:
+    raw = json.dumps([json_serialize(v) for v in values], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, converters: Sequence[Callable]) -> list:
+    """
+    Decode a cursor made by encode_cursor; `converters` restore each value's type
+    (e.g. datetime.fromisoformat). Anything malformed is a 400.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(converters):
+            raise ValueError
+        return [convert(value) for convert, value in zip(converters, values)]
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_filter(sort: List[Tuple[str, int]], values: Sequence) -> dict:
+    """
+    Mongo filter for "strictly after `values`" in `sort` order, e.g. for
+    [("created_at", -1), ("id", -1)]:
+    {"$or": [{"created_at": {"$lt": t}}, {"created_at": t, "id": {"$lt": i}}]}
+    """
+    clauses = []
+    for position, (field, direction) in enumerate(sort):
+        clause = {sort[i][0]: values[i] for i in range(position)}
+        clause[field] = {"$gt" if direction == 1 else "$lt": values[position]}
+        clauses.append(clause)
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+
+def merge_sorted(pages: Iterable[List[dict]], sort: List[Tuple[str, int]], limit: int) -> List[dict]:
+    """
+    The first `limit` documents, in `sort` order, of lists that are each already in
+    that order (one query run over several chunks of ids). Missing values sort
+    lowest, as they do in Mongo.
+    """
+    merged = [doc for page in pages for doc in page]
+    # One stable pass per field, least significant first
+    for field, direction in reversed(sort):
+        merged.sort(key=lambda doc: (doc.get(field) is not None, doc.get(field)), reverse=direction == -1)
+    return merged[:limit]
+
+
+def page_limit(limit: int) -> int:
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be 1-{MAX_PAGE_SIZE}")
+    return limit
+
+
+def parse_datetime(value: str) -> datetime:
+    return datetime.fromisoformat(value)
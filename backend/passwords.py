@@ -0,0 +1,69 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+
+# --- Hashing config ---
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_QUEUE = int(os.environ.get("PASSWORD_HASH_MAX_QUEUE", "64"))
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated thread pool so it never blocks the event loop
+    (bcrypt releases the GIL while hashing). At most `workers` hashes run at once
+    and at most `max_queue` more may wait; beyond that callers get a 503.
+    """
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, max_queue: int = PASSWORD_HASH_MAX_QUEUE, rounds: int = BCRYPT_ROUNDS):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.rounds = rounds
+        self.pending = 0
+        self._executor = None
+
+    async def _run(self, fn, *args):
+        if self.pending >= self.workers + self.max_queue:
+            raise HTTPException(status_code=503, detail="Server busy, please retry", headers={"Retry-After": "1"})
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self.pending -= 1
+
+    # bcrypt is imported on first use to keep it off the cold-start path
+    def _hash(self, password: str) -> str:
+        import bcrypt
+        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(self.rounds)).decode("utf-8")
+
+    @staticmethod
+    def _verify(password: str, hashed: str) -> bool:
+        import bcrypt
+        return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self._hash, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(self._verify, password, hashed)
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """
+        True when `hashed` was made with a different cost factor than the configured one.
+        """
+        try:
+            return int(hashed.split("$")[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_hasher = PasswordHasher()
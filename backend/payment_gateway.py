@@ -0,0 +1,112 @@
+import asyncio
+import importlib
+import os
+import random
+import uuid
+from abc import ABC, abstractmethod
+from typing import Optional
+from pydantic import BaseModel
+from backend.cache import TTLCache
+
+
+class ChargeResult(BaseModel):
+    status: str  # "success" or "declined"
+    gateway_reference: str
+    failure_reason: Optional[str] = None
+
+
+class GatewayError(Exception):
+    """
+    Transient gateway failure (timeout, 5xx). The charge outcome is unknown and the
+    client should retry with the same idempotency key.
+    """
+
+
+class PaymentGateway(ABC):
+    """
+    Interface for payment providers. Implementations must treat `idempotency_key`
+    as the provider-side dedupe key so retried charges are never applied twice.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    async def charge(self, amount: float, currency: str, idempotency_key: str, metadata: dict) -> ChargeResult:
+        ...
+
+
+class SimulatedGateway(PaymentGateway):
+    """
+    Local stand-in for Stripe with configurable latency, declines and transient errors,
+    for load-testing checkout and its retry path without any external service.
+    """
+
+    name = "simulator"
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, decline_rate: float = 0.0,
+                 error_rate: float = 0.0, seed: Optional[int] = None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.decline_rate = decline_rate
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        # idempotency_key -> result, like a real provider replaying a completed charge
+        self._completed = TTLCache(maxsize=100000, ttl=24 * 3600)
+
+    async def charge(self, amount: float, currency: str, idempotency_key: str, metadata: dict) -> ChargeResult:
+        delay = self.latency_ms + self._random.uniform(0, self.jitter_ms)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        completed = self._completed.get(idempotency_key)
+        if completed is not None:
+            return completed
+        # Half of the simulated timeouts happen after the charge went through, which is
+        # exactly the case idempotent retries have to get right
+        failing = self._random.random() < self.error_rate
+        if failing and self._random.random() < 0.5:
+            raise GatewayError("Simulated gateway timeout")
+        if self._random.random() < self.decline_rate:
+            result = ChargeResult(status="declined", gateway_reference=f"sim_{uuid.uuid4().hex}", failure_reason="card_declined")
+        else:
+            result = ChargeResult(status="success", gateway_reference=f"sim_{uuid.uuid4().hex}")
+        self._completed.set(idempotency_key, result)
+        if failing:
+            raise GatewayError("Simulated gateway timeout after charge")
+        return result
+
+
+def _float_env(name: str) -> float:
+    return float(os.getenv(name, "0"))
+
+
+def load_gateway() -> PaymentGateway:
+    """
+    PAYMENT_GATEWAY is "simulator" (default) or a "package.module:ClassName" path
+    to a PaymentGateway subclass.
+    """
+    spec = os.getenv("PAYMENT_GATEWAY", "simulator")
+    if spec == "simulator":
+        return SimulatedGateway(
+            latency_ms=_float_env("PAYMENT_SIM_LATENCY_MS"),
+            jitter_ms=_float_env("PAYMENT_SIM_JITTER_MS"),
+            decline_rate=_float_env("PAYMENT_SIM_DECLINE_RATE"),
+            error_rate=_float_env("PAYMENT_SIM_ERROR_RATE"),
+        )
+    module_name, _, class_name = spec.partition(":")
+    gateway_class = getattr(importlib.import_module(module_name), class_name)
+    return gateway_class()
+
+
+_gateway: Optional[PaymentGateway] = None
+
+
+def get_payment_gateway() -> PaymentGateway:
+    global _gateway
+    if _gateway is None:
+        _gateway = load_gateway()
+    return _gateway
+
+
+def set_payment_gateway(gateway: PaymentGateway):
+    global _gateway
+    _gateway = gateway
@@ -0,0 +1,101 @@
+import re
+from typing import List, Optional, Tuple
+
+# --- price_range parsing ---
+# "$5000 - $15000", "$50 - $150 per person", "From $1,200/hour", "$2.5k", "₹50,000 - 80,000"
+AMOUNT_RE = re.compile(
+    r"(?P<currency>[$₹€£]\s*|\b(?:rs\.?|inr|usd)\s*)?(?P<number>\d[\d,]*(?:\.\d+)?)\s*(?P<thousands>k\b)?",
+    re.IGNORECASE,
+)
+# Numbers that count something other than money: "2 day package", "up to 200 guests"
+QUANTITY_RE = re.compile(
+    r"\s*(?:days?|nights?|hours?|hrs?|minutes?|mins?|guests?|persons?|people|pax|plates?|items?|photos?|pages?|years?|km)\b",
+    re.IGNORECASE,
+)
+TRAILING_CURRENCY_RE = re.compile(r"\s*(?:inr|usd|rs)\b", re.IGNORECASE)
+RANGE_SEPARATOR_RE = re.compile(r"\s*(?:-|–|to)\s*$", re.IGNORECASE)
+UNIT_RE = re.compile(r"(?:\bper\b|/)\s*([a-z]+)", re.IGNORECASE)
+UNIT_ALIASES = {"guest": "person", "head": "person", "people": "person", "plate": "person", "hr": "hour", "day": "day"}
+DEFAULT_PRICE_UNIT = "event"
+
+
+def find_amounts(text: str) -> List[float]:
+    """
+    The prices in `text`. Counts ("2 day", "200 guests") are skipped; when some
+    amounts carry a currency marker, only those count, plus the other end of a
+    range with a marker on one side ("₹50,000 - 80,000", "500-1000 INR").
+    """
+    found = []  # [value, has_currency, is_count, start, end]
+    for match in AMOUNT_RE.finditer(text):
+        value = float(match.group("number").replace(",", ""))
+        if match.group("thousands"):
+            value *= 1000
+        marked = bool(match.group("currency")) or bool(TRAILING_CURRENCY_RE.match(text, match.end()))
+        found.append([value, marked, bool(QUANTITY_RE.match(text, match.end())), match.start(), match.end()])
+    # A marker after a range ("500-1000 INR", "100-200 guests") also covers its lower end
+    for lower, upper in reversed(list(zip(found, found[1:]))):
+        if RANGE_SEPARATOR_RE.match(text[lower[4]:upper[3]]):
+            lower[1] = lower[1] or upper[1]
+            lower[2] = lower[2] or upper[2]
+    found = [(value, marked, start, end) for value, marked, is_count, start, end in found if not is_count]
+    if not any(marked for _, marked, _, _ in found):
+        return [value for value, _, _, _ in found]
+    amounts, previous_end = [], None
+    for value, marked, start, end in found:
+        if marked or (previous_end is not None and RANGE_SEPARATOR_RE.match(text[previous_end:start])):
+            amounts.append(value)
+            previous_end = end
+        else:
+            previous_end = None
+    return amounts
+
+
+def parse_price_range(text: Optional[str]) -> Tuple[Optional[float], Optional[float], Optional[str]]:
+    """
+    Return (min_price, max_price, unit) parsed from a display string, or
+    (None, None, None) when it holds no price. A single price is both min and max.
+    """
+    if not text:
+        return None, None, None
+    amounts = find_amounts(text)
+    if not amounts:
+        return None, None, None
+    unit_match = UNIT_RE.search(text)
+    unit = unit_match.group(1).lower().rstrip("s") if unit_match else DEFAULT_PRICE_UNIT
+    return min(amounts), max(amounts), UNIT_ALIASES.get(unit, unit)
+
+
+# --- Backfill migration ---
+async def backfill_prices(batch_size: int = 1000, reparse: bool = False) -> dict:
+    """
+    Parse `price_range` into min_price/max_price/price_unit for every service that
+    doesn't have them yet. Safe to re-run; it only touches unmigrated documents,
+    or every document with `reparse` (after a parser fix).
+    """
+    from pymongo import UpdateOne
+    from backend.database import db
+
+    counts = {"updated": 0, "unparsed": 0}
+    operations = []
+    query = {} if reparse else {"price_unit": {"$exists": False}}
+    cursor = db.services.find(query, {"_id": 1, "price_range": 1})
+    async for doc in cursor.batch_size(batch_size):
+        min_price, max_price, unit = parse_price_range(doc.get("price_range"))
+        if min_price is None:
+            counts["unparsed"] += 1
+        operations.append(UpdateOne(
+            {"_id": doc["_id"]},
+            {"$set": {"min_price": min_price, "max_price": max_price, "price_unit": unit}},
+        ))
+        if len(operations) >= batch_size:
+            counts["updated"] += (await db.services.bulk_write(operations, ordered=False)).modified_count
+            operations = []
+    if operations:
+        counts["updated"] += (await db.services.bulk_write(operations, ordered=False)).modified_count
+    return counts
+
+
+if __name__ == "__main__":
+    import asyncio
+    import sys
+    print(asyncio.run(backfill_prices(reparse="--reparse" in sys.argv)))
@@ -0,0 +1,89 @@
+from backend import catalog
+from backend.database import db
+from backend.facets import FACET_FIELDS_PROJECTION, service_facets
+
+# --- Stored rating aggregates ---
+# A service keeps rating_sum / review_count next to `rating`; `seed_rating` remembers the
+# rating it had before its first review, and comes back when the last review is deleted.
+RATING_FIELDS_PROJECTION = {**FACET_FIELDS_PROJECTION, "availability": 1, "rating_sum": 1, "review_count": 1, "seed_rating": 1}
+
+
+def average_rating(rating_sum: float, review_count: int, fallback: float) -> float:
+    return round(rating_sum / review_count, 2) if review_count > 0 else fallback
+
+
+async def apply_rating_delta(service_id: str, rating_delta: int, count_delta: int, session=None):
+    """
+    Fold one review write into the service's stored aggregate, in the review write's
+    session. It's a single-document update, so concurrent reviews can't lose each
+    other's increments, and nothing re-reads the reviews collection. Returns the
+    service as it was before, for publish_rating() once the transaction commits.
+    """
+    from pymongo import ReturnDocument
+
+    return await db.services.find_one_and_update({"id": service_id}, [
+        {"$set": {
+            "seed_rating": {"$ifNull": ["$seed_rating", "$rating"]},
+            "rating_sum": {"$add": [{"$ifNull": ["$rating_sum", 0]}, rating_delta]},
+            "review_count": {"$add": [{"$ifNull": ["$review_count", 0]}, count_delta]},
+        }},
+        {"$set": {"rating": {"$cond": [
+            {"$gt": ["$review_count", 0]},
+            {"$round": [{"$divide": ["$rating_sum", "$review_count"]}, 2]},
+            "$seed_rating",
+        ]}}},
+    ], projection=RATING_FIELDS_PROJECTION, return_document=ReturnDocument.BEFORE, session=session)
+
+
+def publish_rating(service_id: str, before: dict, rating_delta: int, count_delta: int):
+    """
+    Bring the in-process views up to date with a committed rating change: the
+    materialized facets, cached service lists and autocomplete ranking.
+    """
+    if not before:
+        return
+    rating_sum = before.get("rating_sum", 0) + rating_delta
+    review_count = before.get("review_count", 0) + count_delta
+    after = {**before, "rating": average_rating(rating_sum, review_count, before.get("seed_rating", before.get("rating")))}
+    # Move the service between rating buckets of the materialized facets
+    service_facets.apply(before, after)
+    if after["rating"] != before.get("rating"):
+        catalog.update_service_rating(service_id, after["rating"])
+
+
+async def reconcile_ratings() -> int:
+    """
+    Recompute every service's aggregate from the reviews themselves and fix the ones
+    that drifted (on a standalone mongod a review and its rating update are not one
+    transaction). Each fix only applies if the aggregate hasn't moved since it was
+    read. Run with `python -m backend.ratings`; returns how many services were fixed.
+    """
+    totals = {}
+    async for total in db.reviews.aggregate([
+        {"$group": {"_id": "$service_id", "rating_sum": {"$sum": "$rating"}, "review_count": {"$sum": 1}}},
+    ]):
+        totals[total["_id"]] = (total["rating_sum"], total["review_count"])
+
+    fixed = 0
+    async for service in db.services.find({}, {"_id": 0, "id": 1, "rating": 1, "seed_rating": 1, "rating_sum": 1, "review_count": 1}):
+        stored = (service.get("rating_sum", 0), service.get("review_count", 0))
+        rating_sum, review_count = totals.get(service.get("id"), (0, 0))
+        if stored == (rating_sum, review_count):
+            continue
+        seed = service.get("seed_rating", service.get("rating"))
+        result = await db.services.update_one(
+            {"id": service["id"], "rating_sum": service.get("rating_sum"), "review_count": service.get("review_count")},
+            {"$set": {
+                "rating_sum": rating_sum,
+                "review_count": review_count,
+                "seed_rating": seed,
+                "rating": average_rating(rating_sum, review_count, seed),
+            }},
+        )
+        fixed += result.modified_count
+    return fixed
+
+
+if __name__ == "__main__":
+    import asyncio
+    print(f"Reconciled {asyncio.run(reconcile_ratings())} services")
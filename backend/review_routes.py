@@ -0,0 +1,111 @@
+from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from typing import Optional
+from backend.auth import get_current_user
+from backend.database import db, in_transaction, indexes_ready, register_indexes
+from backend.loaders import services_by_id
+from backend.models import Review, ReviewCreate, User
+from backend.pagination import decode_cursor, encode_cursor, keyset_filter, page_limit, parse_datetime
+from backend.ratings import apply_rating_delta, publish_rating
+
+router = APIRouter(prefix="/api", tags=["reviews"])
+
+# Newest first; `id` breaks ties between reviews written in the same millisecond
+REVIEW_SORT = [("created_at", -1), ("id", -1)]
+REVIEW_PROJECTION = {"_id": 0}
+
+
+@register_indexes
+async def ensure_review_indexes():
+    await db.reviews.create_index([("service_id", 1), ("user_id", 1)], unique=True, name="one_review_per_user")
+    await db.reviews.create_index([("service_id", 1), ("created_at", -1), ("id", -1)])
+    await db.reviews.create_index("id")
+
+
+@router.post("/services/{service_id}/reviews")
+async def create_review(service_id: str, data: ReviewCreate, current_user: User = Depends(get_current_user)):
+    from pymongo.errors import DuplicateKeyError
+
+    if not await services_by_id.load(service_id):
+        raise HTTPException(status_code=404, detail="Service not found")
+    review = Review(**data.dict(), service_id=service_id, user_id=current_user.id, user_name=current_user.name)
+
+    # ✅ The review and the service's rating aggregate commit together or not at all
+    async def write(session):
+        await db.reviews.insert_one(review.dict(), session=session)
+        return await apply_rating_delta(service_id, review.rating, 1, session)
+
+    await indexes_ready()
+    try:
+        before = await in_transaction(write)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="You have already reviewed this service")
+    publish_rating(service_id, before, review.rating, 1)
+    return review
+
+
+@router.put("/services/{service_id}/reviews")
+async def update_review(service_id: str, data: ReviewCreate, current_user: User = Depends(get_current_user)):
+    from pymongo import ReturnDocument
+
+    changes = {**data.dict(), "updated_at": datetime.utcnow()}
+
+    async def write(session):
+        previous = await db.reviews.find_one_and_update(
+            {"service_id": service_id, "user_id": current_user.id},
+            {"$set": changes},
+            projection=REVIEW_PROJECTION,
+            return_document=ReturnDocument.BEFORE,
+            session=session,
+        )
+        if not previous or data.rating == previous["rating"]:
+            return previous, None
+        return previous, await apply_rating_delta(service_id, data.rating - previous["rating"], 0, session)
+
+    previous, before = await in_transaction(write)
+    if not previous:
+        raise HTTPException(status_code=404, detail="Review not found")
+    publish_rating(service_id, before, data.rating - previous["rating"], 0)
+    return Review(**{**previous, **changes})
+
+
+@router.delete("/services/{service_id}/reviews")
+async def delete_review(service_id: str, current_user: User = Depends(get_current_user)):
+    async def write(session):
+        removed = await db.reviews.find_one_and_delete(
+            {"service_id": service_id, "user_id": current_user.id}, projection=REVIEW_PROJECTION, session=session
+        )
+        if not removed:
+            return None, None
+        return removed, await apply_rating_delta(service_id, -removed["rating"], -1, session)
+
+    removed, before = await in_transaction(write)
+    if not removed:
+        raise HTTPException(status_code=404, detail="Review not found")
+    publish_rating(service_id, before, -removed["rating"], -1)
+    return {"message": "Review deleted"}
+
+
+@router.get("/services/{service_id}/reviews")
+async def list_reviews(service_id: str, limit: int = 20, cursor: Optional[str] = None):
+    """
+    Newest reviews first, keyset-paginated: pass `next_cursor` back as `cursor`.
+    Each page is one range scan on (service_id, created_at, id), however deep it is.
+    """
+    limit = page_limit(limit)
+    query = {"service_id": service_id}
+    if cursor:
+        query.update(keyset_filter(REVIEW_SORT, decode_cursor(cursor, [parse_datetime, str])))
+    docs = await db.reviews.find(query, REVIEW_PROJECTION).sort(REVIEW_SORT).limit(limit + 1).to_list(limit + 1)
+
+    page = docs[:limit]
+    next_cursor = encode_cursor([page[-1]["created_at"], page[-1]["id"]]) if len(docs) > limit else None
+    response = {"reviews": [Review(**doc) for doc in page], "next_cursor": next_cursor}
+    if not cursor:
+        # The first page carries the summary, read straight off the service document
+        summary = await db.services.find_one({"id": service_id}, {"_id": 0, "rating": 1, "review_count": 1})
+        if not summary:
+            raise HTTPException(status_code=404, detail="Service not found")
+        response["rating"] = summary.get("rating")
+        response["review_count"] = summary.get("review_count", 0)
+    return response
@@ -0,0 +1,336 @@
+import heapq
+import math
+import re
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = {"a", "an", "and", "at", "for", "in", "of", "on", "or", "the", "to", "with"}
+
+# --- Field weights (BM25F-style) ---
+FIELD_WEIGHTS = {"name": 3.0, "description": 1.0}
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+# --- Location filter in Mongo ---
+def location_tokens(location: Optional[str]) -> List[str]:
+    """
+    Stored on each service as `location_tokens`, so Mongo can apply the same
+    location filter as match_location() and sort / page the result itself.
+    """
+    return sorted(set(tokenize(location)))
+
+
+def location_filter(location: Optional[str]) -> Optional[dict]:
+    """
+    Mongo filter for services whose location has a token starting with each token of
+    `location`; anchored prefixes use the `location_tokens` index. None when the filter
+    has no usable tokens.
+    """
+    tokens = tokenize(location)
+    if not tokens:
+        return None
+    return {"location_tokens": {"$all": [re.compile("^" + re.escape(token)) for token in tokens]}}
+
+
+def edit_distance_within(a: str, b: str, max_distance: int) -> bool:
+    """
+    Bounded Levenshtein check: True if a and b are at most max_distance edits apart.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return False
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j, cb in enumerate(b, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            row_min = min(row_min, current[j])
+        if row_min > max_distance:
+            return False
+        previous = current
+    return previous[-1] <= max_distance
+
+
+class ServiceSearchIndex:
+    """
+    In-process inverted index over the services catalog.
+
+    Text search covers `name` and `description` with BM25 ranking; `location`,
+    `category` and `availability` are kept alongside so the existing filters can
+    be applied without a collection scan.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.postings: Dict[str, Dict[str, float]] = {}
+        self.location_postings: Dict[str, Set[str]] = {}
+        self.docs: Dict[str, dict] = {}
+        self.total_length = 0.0
+        self._vocabulary: List[str] = []
+        self._location_vocabulary: List[str] = []
+        self._vocabulary_dirty = False
+        self._impacts: Dict[str, List[Tuple[float, str]]] = {}
+
+    def __len__(self):
+        return len(self.docs)
+
+    # --- Writes ---
+    def add(self, service: dict):
+        service_id = service["id"]
+        if service_id in self.docs:
+            self.remove(service_id)
+
+        weighted_tf: Dict[str, float] = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in tokenize(service.get(field)):
+                weighted_tf[token] = weighted_tf.get(token, 0.0) + weight
+        length = sum(weighted_tf.values())
+        location_tokens = set(tokenize(service.get("location")))
+
+        for token, tf in weighted_tf.items():
+            self.postings.setdefault(token, {})[service_id] = tf
+        for token in location_tokens:
+            self.location_postings.setdefault(token, set()).add(service_id)
+
+        self.docs[service_id] = {
+            "category": service.get("category"),
+            "availability": service.get("availability", True),
+            "length": length,
+            "terms": tuple(weighted_tf),
+            "location_terms": tuple(location_tokens),
+        }
+        self.total_length += length
+        self._vocabulary_dirty = True
+        self._impacts.clear()
+
+    def remove(self, service_id: str):
+        doc = self.docs.pop(service_id, None)
+        if not doc:
+            return
+        for token in doc["terms"]:
+            posting = self.postings.get(token)
+            if posting is not None:
+                posting.pop(service_id, None)
+                if not posting:
+                    del self.postings[token]
+        for token in doc["location_terms"]:
+            ids = self.location_postings.get(token)
+            if ids is not None:
+                ids.discard(service_id)
+                if not ids:
+                    del self.location_postings[token]
+        self.total_length -= doc["length"]
+        self._vocabulary_dirty = True
+        self._impacts.clear()
+
+    def rebuild(self, services: Iterable[dict]):
+        self.clear()
+        for service in services:
+            self.add(service)
+
+    # --- Scoring ---
+    def _term_score(self, tf: float, service_id: str, avg_length: float) -> float:
+        length = self.docs[service_id]["length"]
+        return tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length))
+
+    def _impact_list(self, term: str, avg_length: float) -> List[Tuple[float, str]]:
+        """
+        Posting list for `term` ordered by BM25 term score, built lazily and dropped on
+        the next write. Lets single-term queries stop after `limit` accepted hits.
+        """
+        impacts = self._impacts.get(term)
+        if impacts is None:
+            impacts = sorted(
+                ((self._term_score(tf, sid, avg_length), sid) for sid, tf in self.postings[term].items()),
+                reverse=True,
+            )
+            self._impacts[term] = impacts
+        return impacts
+
+    def _search_impact_ordered(self, groups, accept, avg_length: float, limit: int) -> List[Tuple[str, float]]:
+        """
+        MaxScore-style top-k: walk the driving term's postings best-first and stop once
+        no remaining document can beat the current k-th score.
+        """
+        term, _, weight = groups[0][0]
+        other_bounds = 0.0
+        for group in groups[1:]:
+            other_bounds += max(w * self._impact_list(t, avg_length)[0][0] for t, _, w in group)
+
+        heap: List[Tuple[float, str]] = []
+        for impact, service_id in self._impact_list(term, avg_length):
+            if len(heap) >= limit and weight * impact + other_bounds <= heap[0][0]:
+                break
+            if not accept(service_id):
+                continue
+            total = weight * impact
+            for group in groups[1:]:
+                best = 0.0
+                for _, posting, w in group:
+                    tf = posting.get(service_id)
+                    if tf is not None:
+                        best = max(best, w * self._term_score(tf, service_id, avg_length))
+                if not best:
+                    break
+                total += best
+            else:
+                if len(heap) < limit:
+                    heapq.heappush(heap, (total, service_id))
+                elif total > heap[0][0]:
+                    heapq.heapreplace(heap, (total, service_id))
+        return [(service_id, score) for score, service_id in sorted(heap, reverse=True)]
+
+    # --- Term expansion ---
+    def _refresh_vocabulary(self):
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self.postings)
+            self._location_vocabulary = sorted(self.location_postings)
+            self._vocabulary_dirty = False
+
+    @staticmethod
+    def _prefix_matches(vocabulary: List[str], prefix: str) -> List[str]:
+        matches = []
+        position = bisect_left(vocabulary, prefix)
+        while position < len(vocabulary) and vocabulary[position].startswith(prefix):
+            matches.append(vocabulary[position])
+            position += 1
+        return matches
+
+    def _expand(self, token: str, vocabulary: List[str], postings: dict, prefix: bool, fuzzy: bool) -> List[Tuple[str, float]]:
+        """
+        Map a query token to (index term, boost) pairs. Exact hits score highest,
+        prefix hits keep the old substring-search feel, fuzzy hits cover typos.
+        """
+        expanded = {}
+        if token in postings:
+            expanded[token] = 1.0
+        if prefix:
+            for term in self._prefix_matches(vocabulary, token):
+                expanded.setdefault(term, 0.8)
+        if fuzzy and not expanded and len(token) >= 4:
+            max_distance = 1 if len(token) < 8 else 2
+            for term in self._prefix_matches(vocabulary, token[0]):
+                if edit_distance_within(token, term, max_distance):
+                    expanded.setdefault(term, 0.5)
+        return list(expanded.items())
+
+    # --- Queries ---
+    def match_location(self, location: str) -> Optional[Set[str]]:
+        """
+        Ids whose location contains every token of `location` (prefix match per token).
+        Returns None when the filter has no usable tokens.
+        """
+        tokens = tokenize(location)
+        if not tokens:
+            return None
+        self._refresh_vocabulary()
+        result: Optional[Set[str]] = None
+        for token in tokens:
+            ids: Set[str] = set()
+            for term in self._prefix_matches(self._location_vocabulary, token):
+                ids |= self.location_postings[term]
+            result = ids if result is None else result & ids
+            if not result:
+                return set()
+        return result
+
+    def search(
+        self,
+        text: Optional[str] = None,
+        *,
+        category: Optional[str] = None,
+        location: Optional[str] = None,
+        available_only: bool = True,
+        fuzzy: bool = False,
+        limit: int = 100,
+    ) -> List[Tuple[str, float]]:
+        """
+        Return up to `limit` (service_id, score) pairs, best match first.
+        Every query token must match (AND semantics); the last token is also
+        treated as a prefix so partially typed words still hit.
+        """
+        allowed = self.match_location(location) if location else None
+        if allowed is not None and not allowed:
+            return []
+
+        def accept(service_id: str) -> bool:
+            doc = self.docs[service_id]
+            if available_only and not doc["availability"]:
+                return False
+            if category and doc["category"] != category:
+                return False
+            return allowed is None or service_id in allowed
+
+        tokens = tokenize(text)
+        if not tokens:
+            # Sorted so the same filter returns the same order in every process
+            candidates = sorted(allowed) if allowed is not None else self.docs
+            results = []
+            for service_id in candidates:
+                if accept(service_id):
+                    results.append((service_id, 0.0))
+                    if len(results) >= limit:
+                        break
+            return results
+
+        self._refresh_vocabulary()
+        total_docs = len(self.docs) or 1
+        avg_length = (self.total_length / total_docs) or 1.0
+
+        # Expand every token up front, then intersect starting from the rarest one
+        groups = []
+        for position, token in enumerate(tokens):
+            is_last = position == len(tokens) - 1
+            group = []
+            for term, boost in self._expand(token, self._vocabulary, self.postings, is_last, fuzzy):
+                posting = self.postings[term]
+                idf = math.log(1 + (total_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+                group.append((term, posting, boost * idf))
+            if not group:
+                return []
+            groups.append(group)
+        groups.sort(key=lambda g: sum(len(posting) for _, posting, _ in g))
+
+        if len(groups[0]) == 1:
+            return self._search_impact_ordered(groups, accept, avg_length, limit)
+
+        term_score = lambda tf, service_id: self._term_score(tf, service_id, avg_length)
+        scores: Dict[str, float] = {}
+        for _, posting, weight in groups[0]:
+            for service_id, tf in posting.items():
+                if service_id in scores or accept(service_id):
+                    score = weight * term_score(tf, service_id)
+                    if score > scores.get(service_id, 0.0):
+                        scores[service_id] = score
+
+        for group in groups[1:]:
+            narrowed: Dict[str, float] = {}
+            for service_id, total in scores.items():
+                best = 0.0
+                for _, posting, weight in group:
+                    tf = posting.get(service_id)
+                    if tf is not None:
+                        best = max(best, weight * term_score(tf, service_id))
+                if best:
+                    narrowed[service_id] = total + best
+            scores = narrowed
+            if not scores:
+                return []
+
+        # Ties go by id, like the impact-ordered path, so pages don't shift between processes
+        return heapq.nlargest(
+            limit,
+            scores.items(),
+            key=lambda item: (item[1], item[0]),
+        )
+
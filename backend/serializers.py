@@ -0,0 +1,47 @@
+import json
+from datetime import datetime
+from bson import ObjectId
+
+
+# --- Serialize MongoDB document ---
+def serialize_mongo_document(doc):
+    doc = dict(doc)
+    if "_id" in doc:
+        doc["id"] = str(doc["_id"])
+        del doc["_id"]
+    if "created_at" in doc and isinstance(doc["created_at"], datetime):
+        doc["created_at"] = doc["created_at"].isoformat()
+    return doc
+
+
+# Custom JSON serializer
+def json_serialize(obj):
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return obj
+
+
+# --- Fast JSON encoding (orjson when installed) ---
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+
+def dumps_json(obj) -> bytes:
+    """
+    Compact JSON bytes. orjson encodes datetimes and str enums natively and is
+    several times faster than the stdlib on large lists.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=json_serialize_strict)
+    return json.dumps(obj, default=json_serialize_strict, separators=(",", ":")).encode("utf-8")
+
+
+def json_serialize_strict(obj):
+    value = json_serialize(obj)
+    if value is obj:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return value
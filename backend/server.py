@@ -1,23 +1,56 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Request, Response, status
+from fastapi.responses import PlainTextResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from contextlib import asynccontextmanager
+import asyncio
 import os
 import logging
+import hashlib
 from pathlib import Path
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from pydantic import TypeAdapter
 import uuid
-from datetime import datetime, timedelta
-import jwt
-import bcrypt
-from enum import Enum
+from datetime import datetime
 from backend.appointment_routes import router as appointment_router
-from pydantic import BaseModel, EmailStr, Field
+from backend.service_import_routes import router as service_import_router
+from backend.export_routes import router as export_router
+from backend.fake_stripe_routes import router as payment_router
+from backend.review_routes import router as review_router
+from backend import catalog, database
+from backend.auth import create_jwt_token, get_current_user, user_cache
+from backend.autocomplete import SUGGESTION_TYPES
+from backend.availability_stream import availability_broadcaster
+from backend.catalog import AUTOCOMPLETE_MAX_LIMIT, get_autocomplete_index, get_service_index, invalidate_service_catalog, services_cache
+from backend.compression import COMPRESSION_MIN_BYTES, CompressionMiddleware, encoded_variant, negotiate_encoding
+from backend.database import db, register_indexes
+from backend.loaders import services_by_id, users_by_id
+from backend.facets import aggregate_facets, empty_counts, format_counts, service_facets, sum_counts
+from backend.jobs import job_queue
+from backend.metrics import MetricsMiddleware, render_metrics
+from backend.models import ServiceCategory, User, UserRegister, UserLogin, Service, ServiceNearby
+from backend.pagination import MAX_PAGE_SIZE, decode_cursor, encode_cursor, keyset_filter, merge_sorted, page_limit, parse_datetime
+from backend.passwords import password_hasher
+from backend.pricing import parse_price_range
+from backend.search import location_filter, location_tokens
+from backend.serializers import dumps_json, serialize_mongo_document
+from backend.throttling import login_throttle, register_throttle
+
+# --- App lifespan: one shared Mongo client per worker ---
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await database.connect()
+    if not database.FAST_START:
+        await get_service_index()  # ✅ search + autocomplete indexes ready before the first request
+        job_queue.start()  # serverless hosts run `python -m backend.jobs` instead
+    yield
+    await job_queue.stop()
+    await availability_broadcaster.stop()
+    password_hasher.shutdown()
+    database.close()
 
 # --- Create app first ---
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # --- Create router for /api ---
 api_router = APIRouter(prefix="/api")
@@ -26,128 +59,46 @@ api_router = APIRouter(prefix="/api")
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / ".env")
 
-# --- MongoDB connection ---
-
-mongo_url = os.environ.get("MONGO_URL")
-db_name = os.environ.get("DB_NAME")
-
-if not mongo_url or not db_name:
-    raise RuntimeError("MONGO_URL and DB_NAME must be set in Vercel")
-
-client = AsyncIOMotorClient(mongo_url)
-db = client[db_name]
-
-
-# --- JWT Config ---
-JWT_SECRET = os.environ.get("JWT_SECRET")
-if not JWT_SECRET:
-    raise RuntimeError("JWT_SECRET must be set in Vercel")
-
-JWT_ALGORITHM = "HS256"
-JWT_EXPIRATION_HOURS = 24
-
-
-# --- Security ---
-security = HTTPBearer()
-
-# --- Service Categories ---
-class ServiceCategory(str, Enum):
-    VENUE = "venues"
-    CATERING = "catering"
-    DECORATION = "decoration"
-    PHOTOGRAPHY = "photography"
-    MAKEUP = "makeup"
-    DJ = "dj"
-    TRANSPORT = "transport"
-    GIFTS = "gifts"
-
-# --- Models ---
-class User(BaseModel): 
-    id: str = Field(default_factory=lambda: str(uuid.uuid4())) 
-    name: str 
-    email: str 
-    phone: str | None = None 
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-
-class UserRegister(BaseModel):
-    name: str
-    email: str
-    password: str
-    phone: str | None = None
-
-class UserLogin(BaseModel):
-    email: str
-    password: str
-
-class Service(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    name: str
-    category: ServiceCategory
-    description: str
-    price_range: str
-    location: str
-    rating: float = 4.0
-    image_url: str
-    contact_phone: str
-    contact_email: str
-    availability: bool = True
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-
 # --- Helper Functions ---
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
-
-def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+async def hash_password(password: str) -> str:
+    return await password_hasher.hash(password)
 
-def create_jwt_token(user_id: str) -> str:
-    payload = {"user_id": user_id, "exp": datetime.utcnow() + timedelta(hours=JWT_EXPIRATION_HOURS)}
-    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+async def verify_password(password: str, hashed: str) -> bool:
+    return await password_hasher.verify(password, hashed)
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    try:
-        payload = jwt.decode(credentials.credentials, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        user_id = payload.get("user_id")
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        user = await db.users.find_one({"id": user_id})
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
-        return User(**user)
-    except jwt.ExpiredSignatureError:
-        raise HTTPException(status_code=401, detail="Token expired")
-    except jwt.JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
-# --- Serialize MongoDB document ---
-def serialize_mongo_document(doc):
-    doc = dict(doc)
-    if "_id" in doc:
-        doc["id"] = str(doc["_id"])
-        del doc["_id"]
-    if "created_at" in doc and isinstance(doc["created_at"], datetime):
-        doc["created_at"] = doc["created_at"].isoformat()
-    return doc
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
 
 # --- Auth Routes ---
 @api_router.post("/register")
-async def register_user(user_data: UserRegister):
+async def register_user(user_data: UserRegister, request: Request):
+    await register_throttle.check(request, user_data.email)
     if await db.users.find_one({"email": user_data.email}):
         raise HTTPException(status_code=400, detail="Email already registered")
     user_dict = user_data.dict()
-    user_dict["password"] = hash_password(user_data.password)
+    user_dict["password"] = await hash_password(user_data.password)
     user_obj = User(**{k: v for k, v in user_dict.items() if k != "password"})
     await db.users.insert_one({**user_obj.dict(), "password": user_dict["password"]})
-    token = create_jwt_token(user_obj.id)
+    token = create_jwt_token(user_obj)
     return {"user": user_obj, "token": token}
 
 @api_router.post("/login")
-async def login_user(login_data: UserLogin):
+async def login_user(login_data: UserLogin, request: Request):
+    # ✅ Throttle before any Mongo or bcrypt work
+    await login_throttle.check(request, login_data.email)
     user_record = await db.users.find_one({"email": login_data.email})
-    if not user_record or not verify_password(login_data.password, user_record["password"]):
+    if not user_record or not await verify_password(login_data.password, user_record["password"]):
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    # ✅ Migrate hashes made with an older cost factor while we have the plaintext
+    if password_hasher.needs_rehash(user_record["password"]):
+        new_hash = await hash_password(login_data.password)
+        await db.users.update_one({"id": user_record["id"]}, {"$set": {"password": new_hash}})
     user_obj = User(**{k: v for k, v in user_record.items() if k != "password"})
-    token = create_jwt_token(user_obj.id)
+    token = create_jwt_token(user_obj)
     return {"user": user_obj, "token": token}
 
 @api_router.get("/profile")
@@ -171,15 +122,18 @@ async def update_profile(
         raise HTTPException(status_code=400, detail="No valid fields to update")
 
     await db.users.update_one({"id": current_user.id}, {"$set": update_data})
+    user_cache.pop(current_user.id)
+    users_by_id.forget(current_user.id)
     updated_user = await db.users.find_one({"id": current_user.id})
-    return {"message": "Profile updated", "user": serialize_mongo_document(updated_user)}
+    token = create_jwt_token(User(**updated_user))
+    return {"message": "Profile updated", "user": serialize_mongo_document(updated_user), "token": token}
 
 @api_router.get("/chat/{service_id}")
 async def get_whatsapp_chat_link(service_id: str, current_user: User = Depends(get_current_user)):
     """
     Returns a WhatsApp link so the logged-in user can message the service provider directly.
     """
-    service = await db.services.find_one({"id": service_id})
+    service = await services_by_id.load(service_id)
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
 
@@ -197,31 +151,364 @@ async def get_whatsapp_chat_link(service_id: str, current_user: User = Depends(g
     return {"whatsapp_link": whatsapp_url}
 
 # --- Service Routes ---
-@api_router.get("/services", response_model=List[Service])
-async def get_services(
-    category: Optional[str] = None,
-    location: Optional[str] = None,
-    search: Optional[str] = None
-):
+# Only the fields the response model needs come back from Mongo (no _id)
+SERVICE_RESPONSE_PROJECTION = {"_id": 0, **{name: 1 for name in Service.model_fields}}
+service_list_adapter = TypeAdapter(List[Service])
+nearby_list_adapter = TypeAdapter(List[ServiceNearby])
+
+# --- "Near me" search config ---
+GEO_DEFAULT_RADIUS_KM = float(os.environ.get("GEO_DEFAULT_RADIUS_KM", "25"))
+GEO_MAX_RADIUS_KM = float(os.environ.get("GEO_MAX_RADIUS_KM", "500"))
+
+# Wishlist / cart batch fetch (?ids=a,b,c)
+SERVICES_BATCH_MAX_IDS = 100
+
+# Relevance-ranked ids checked against a budget filter in Mongo; only relevance order is cut off
+SEARCH_CANDIDATES = 2000
+# Text matches Mongo sorts itself go in $in chunks of this many ids, well under the 16 MB command limit
+SEARCH_IN_CHUNK = 20000
+
+# ✅ Sort orders; `id` breaks ties so pages are stable. Each one, or its exact
+# reverse, matches an index below, so a page is an index walk rather than an in-memory sort.
+SERVICE_SORTS = {
+    "price_asc": [("min_price", 1), ("id", 1)],
+    "price_desc": [("min_price", -1), ("id", -1)],
+    "rating": [("rating", -1), ("id", 1)],
+}
+# Plain browsing (no search, no sort) is newest first
+DEFAULT_SERVICE_SORT = [("created_at", -1), ("id", -1)]
+# "Near me" without a sort pages by the raw $geoNear distance in meters
+NEARBY_SORT = [("_distance", 1), ("id", 1)]
+
+def optional_datetime(value):
+    return None if value is None else parse_datetime(value)
+
+# How each sort field's cursor value is restored
+CURSOR_CONVERTERS = {"min_price": float, "rating": float, "_distance": float, "created_at": optional_datetime, "id": str}
+
+def decode_sort_cursor(cursor: str, sort_spec: List[tuple]) -> list:
+    return decode_cursor(cursor, [CURSOR_CONVERTERS[field] for field, _ in sort_spec])
+
+def next_sort_cursor(docs: List[dict], limit: int, sort_spec: List[tuple]) -> Optional[str]:
+    # One extra document was fetched; if it came back there is another page
+    if len(docs) <= limit:
+        return None
+    last = docs[limit - 1]
+    return encode_cursor([last.get(field) for field, _ in sort_spec])
+
+def services_query(category: Optional[str], location: Optional[str], min_price: Optional[float], max_price: Optional[float],
+                   sort: Optional[str]) -> dict:
+    """
+    Mongo filter shared by the browse, "near me" and facet paths. A service fits a budget
+    when its price range overlaps [min_price, max_price].
+    """
     query = {"availability": True}
+    if category:
+        query["category"] = category
+    if location:
+        query.update(location_filter(location) or {})
+    price = {}
+    if max_price is not None:
+        price["$lte"] = max_price
+    if sort in ("price_asc", "price_desc"):
+        price["$ne"] = None  # unpriced services have nothing to sort by
+    if price:
+        query["min_price"] = price
+    if min_price is not None:
+        query["max_price"] = {"$gte": min_price}
+    return query
+
+async def search_candidate_ids(category, location, search, fuzzy, limit: Optional[int] = None) -> List[str]:
+    """
+    Ids matching the text search, best first; every match unless `limit` is given.
+    """
+    index = await get_service_index()
+    ranked = index.search(search, category=category, location=location, fuzzy=fuzzy,
+                          limit=len(index) if limit is None else limit)
+    return [service_id for service_id, _ in ranked]
+
+def id_chunks(ids: List[str]) -> List[List[str]]:
+    return [ids[start:start + SEARCH_IN_CHUNK] for start in range(0, len(ids), SEARCH_IN_CHUNK)]
+
+async def find_services(
+    category: Optional[str],
+    location: Optional[str],
+    search: Optional[str],
+    fuzzy: bool,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    sort: Optional[str] = None,
+    limit: int = MAX_PAGE_SIZE,
+    cursor: Optional[str] = None
+) -> Tuple[List[Service], Optional[str]]:
+    """
+    One page of services and the cursor for the next page (None on the last one).
+    """
+    query = services_query(category, location, min_price, max_price, sort)
+    if search and not sort:
+        return await find_services_by_relevance(query, category, location, search, fuzzy, limit, cursor)
+
+    # ✅ A sorted page is one range scan on (filters..., sort key, id), however deep;
+    # a location filter without search text pages here too, newest first
+    sort_spec = SERVICE_SORTS[sort] if sort else DEFAULT_SERVICE_SORT
+    if cursor:
+        query = {"$and": [query, keyset_filter(sort_spec, decode_sort_cursor(cursor, sort_spec))]}
+    if search:
+        # Every text match is sorted, not just the best-ranked ones
+        ids = await search_candidate_ids(category, location, search, fuzzy)
+        if not ids:
+            return [], None
+        pages = await asyncio.gather(*(
+            db.services.find({"$and": [query, {"id": {"$in": chunk}}]}, SERVICE_RESPONSE_PROJECTION).sort(sort_spec).to_list(limit + 1)
+            for chunk in id_chunks(ids)
+        ))
+        services = merge_sorted(pages, sort_spec, limit + 1)
+    else:
+        services = await db.services.find(query, SERVICE_RESPONSE_PROJECTION).sort(sort_spec).to_list(limit + 1)
+    next_cursor = next_sort_cursor(services, limit, sort_spec)
+    # ✅ The one validation pass; the encoded body below bypasses response_model
+    return service_list_adapter.validate_python(services[:limit]), next_cursor
+
+async def find_services_by_relevance(query: dict, category, location, search, fuzzy, limit: int, cursor: Optional[str]):
+    """
+    Relevance order only exists in the search index, so here the cursor is the
+    position in its ranking and Mongo fetches just the page's ids.
+    """
+    offset = decode_cursor(cursor, [int])[0] if cursor else 0
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    narrowed = "min_price" in query or "max_price" in query
+    ids = await search_candidate_ids(category, location, search, fuzzy, SEARCH_CANDIDATES if narrowed else offset + limit + 1)
+    if narrowed and ids:
+        # The budget filter lives in Mongo; keep the ranking of the ids that pass it
+        matching = {doc["id"] async for doc in db.services.find({**query, "id": {"$in": ids}}, {"_id": 0, "id": 1})}
+        ids = [service_id for service_id in ids if service_id in matching]
+    page_ids = ids[offset:offset + limit]
+    if not page_ids:
+        return [], None
+    next_cursor = encode_cursor([offset + limit]) if len(ids) > offset + limit else None
+
+    services = await db.services.find({**query, "id": {"$in": page_ids}}, SERVICE_RESPONSE_PROJECTION).to_list(len(page_ids))
+    rank = {service_id: position for position, service_id in enumerate(page_ids)}
+    services.sort(key=lambda s: rank.get(s["id"], len(rank)))
+    return service_list_adapter.validate_python(services), next_cursor
+
+async def find_services_near(
+    category: Optional[str],
+    location: Optional[str],
+    search: Optional[str],
+    fuzzy: bool,
+    near: tuple,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    sort: Optional[str] = None,
+    limit: int = MAX_PAGE_SIZE,
+    cursor: Optional[str] = None
+) -> Tuple[List[ServiceNearby], Optional[str]]:
+    """
+    Services within `radius_km` of (lat, lng), nearest first unless `sort` is given,
+    via the 2dsphere index. Text search still narrows the candidates through the
+    search index.
+    """
+    lat, lng, radius_km = near
+    query = services_query(category, location, min_price, max_price, sort)
+    sort_spec = SERVICE_SORTS[sort] if sort else NEARBY_SORT
+    after = decode_sort_cursor(cursor, sort_spec) if cursor else None
+
+    def pipeline(query: dict) -> list:
+        geo_near = {
+            "near": {"type": "Point", "coordinates": [lng, lat]},
+            "key": "geo",
+            "distanceField": "_distance",
+            "maxDistance": radius_km * 1000,
+            "query": query,
+            "spherical": True,
+        }
+        if after and not sort:
+            # ✅ Later pages start the index walk at the previous page's last distance
+            geo_near["minDistance"] = after[0]
+        stages = [{"$geoNear": geo_near}, {"$sort": dict(sort_spec)}]
+        if after:
+            stages.append({"$match": keyset_filter(sort_spec, after)})
+        return stages + [
+            {"$limit": limit + 1},
+            {"$project": {
+                **SERVICE_RESPONSE_PROJECTION,
+                "_distance": 1,
+                "distance_km": {"$round": [{"$multiply": ["$_distance", 0.001]}, 3]},
+            }},
+        ]
 
+    if search:
+        ids = await search_candidate_ids(category, location, search, fuzzy)
+        if not ids:
+            return [], None
+        pages = await asyncio.gather(*(
+            db.services.aggregate(pipeline({**query, "id": {"$in": chunk}})).to_list(limit + 1)
+            for chunk in id_chunks(ids)
+        ))
+        services = merge_sorted(pages, sort_spec, limit + 1)
+    else:
+        services = await db.services.aggregate(pipeline(query)).to_list(limit + 1)
+    next_cursor = next_sort_cursor(services, limit, sort_spec)
+    return nearby_list_adapter.validate_python(services[:limit]), next_cursor
+
+def parse_near(lat: Optional[float], lng: Optional[float], radius_km: Optional[float]) -> Optional[tuple]:
+    if lat is None and lng is None:
+        return None
+    if lat is None or lng is None:
+        raise HTTPException(status_code=400, detail="lat and lng must be given together")
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        raise HTTPException(status_code=400, detail="lat/lng out of range")
+    radius_km = GEO_DEFAULT_RADIUS_KM if radius_km is None else radius_km
+    if not 0 < radius_km <= GEO_MAX_RADIUS_KM:
+        raise HTTPException(status_code=400, detail=f"radius_km must be between 0 and {GEO_MAX_RADIUS_KM:g}")
+    # ~11 m precision is plenty for "near me" and keeps the response cache useful
+    return (round(lat, 4), round(lng, 4), radius_km)
+
+def normalize_service_filters(category: Optional[str], location: Optional[str], search: Optional[str]) -> tuple:
     # ✅ Category filter (skip if 'all')
-    if category and category.lower() != "all" and category in [c.value for c in ServiceCategory]:
-        query["category"] = category
+    if not (category and category.lower() != "all" and category in [c.value for c in ServiceCategory]):
+        category = None
 
     # ✅ Location filter (skip if 'All Locations' or 'all')
-    if location and location.lower() not in ["all locations", "all"]:
-        query["location"] = {"$regex": location, "$options": "i"}
+    location = location.strip().lower() if location else None
+    if location in ["all locations", "all", ""]:
+        location = None
 
-    # ✅ Search filter
-    if search:
-        query["$or"] = [
-            {"name": {"$regex": search, "$options": "i"}},
-            {"description": {"$regex": search, "$options": "i"}},
-        ]
+    search = search.strip().lower() or None if search else None
+    return category, location, search
 
-    services = await db.services.find(query).to_list(100)
-    return [Service(**s) for s in services]
+def encode_services(services: List[Service], adapter: TypeAdapter = service_list_adapter) -> bytes:
+    return dumps_json(adapter.dump_python(services))
+
+@api_router.get("/services", response_model=List[Service])
+async def get_services(
+    request: Request,
+    category: Optional[str] = None,
+    location: Optional[str] = None,
+    search: Optional[str] = None,
+    fuzzy: bool = False,
+    lat: Optional[float] = None,
+    lng: Optional[float] = None,
+    radius_km: Optional[float] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    sort: Optional[str] = None,
+    ids: Optional[str] = None,
+    limit: int = MAX_PAGE_SIZE,
+    cursor: Optional[str] = None
+):
+    """
+    Browse services. Pass `lat`/`lng` (and optionally `radius_km`) for a "near me"
+    search sorted by distance; each result then carries `distance_km`.
+    `min_price`/`max_price` are the budget, `sort` is price_asc, price_desc or rating.
+    `ids` (comma separated) instead fetches exactly those services, in that order.
+    Pages hold `limit` services; the `X-Next-Cursor` header, passed back as `cursor`
+    with the same filters, fetches the next page and is absent on the last one.
+    """
+    if ids is not None:
+        return await get_services_by_ids(request, ids)
+    category, location, search = normalize_service_filters(category, location, search)
+    near = parse_near(lat, lng, radius_km)
+    if sort in ("", "relevance"):
+        sort = None
+    if sort is not None and sort not in SERVICE_SORTS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of: relevance, {', '.join(SERVICE_SORTS)}")
+    if min_price is not None and max_price is not None and min_price > max_price:
+        raise HTTPException(status_code=400, detail="min_price must not exceed max_price")
+    limit = page_limit(limit)
+    cache_key = (category, location, search, fuzzy, near, min_price, max_price, sort, limit, cursor or None)
+
+    cached = services_cache.get(cache_key)
+    if cached is None:
+        generation = catalog.catalog_generation
+        if near:
+            services, next_cursor = await find_services_near(
+                category, location, search, fuzzy, near, min_price, max_price, sort, limit, cursor
+            )
+            body = encode_services(services, nearby_list_adapter)
+        else:
+            services, next_cursor = await find_services(
+                category, location, search, fuzzy, min_price, max_price, sort, limit, cursor
+            )
+            body = encode_services(services)
+        # Encoded variants are filled in lazily, so a cached list is compressed at most once per encoding
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+        cached = (hashlib.sha256(body).hexdigest()[:32], {None: body}, headers)
+        # Don't cache a result that raced with a catalog write
+        if generation == catalog.catalog_generation:
+            services_cache.set(cache_key, cached)
+
+    return encoded_response(request, cached)
+
+async def get_services_by_ids(request: Request, ids: str) -> Response:
+    wanted = list(dict.fromkeys(i.strip() for i in ids.split(",") if i.strip()))
+    if not 1 <= len(wanted) <= SERVICES_BATCH_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"Provide 1-{SERVICES_BATCH_MAX_IDS} service ids")
+    # Unavailable services are kept (a wishlist still shows them); unknown ids are skipped
+    found = [doc for doc in await services_by_id.load_many(wanted) if doc is not None]
+    body = encode_services(service_list_adapter.validate_python(found))
+    return encoded_response(request, (hashlib.sha256(body).hexdigest()[:32], {None: body}, {}))
+
+def encoded_response(request: Request, cached: tuple) -> Response:
+    """
+    Serve a (digest, {encoding: body}, extra headers) entry with content negotiation and ETags.
+    """
+    digest, variants, extra_headers = cached
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    if len(variants[None]) < COMPRESSION_MIN_BYTES:
+        encoding = None
+    # Each encoding is its own representation, so it gets its own strong ETag
+    etag = f'"{digest}-{encoding}"' if encoding else f'"{digest}"'
+    headers = {"ETag": etag, "Vary": "Accept-Encoding", **extra_headers}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=encoded_variant(variants, encoding), media_type="application/json", headers=headers)
+
+@api_router.get("/autocomplete")
+async def autocomplete(q: str = "", limit: int = 10, types: Optional[str] = None):
+    """
+    Typeahead suggestions for the search box: service names, categories and locations
+    with a word starting with `q`. `types` is a comma-separated subset of those kinds.
+    """
+    if not 1 <= limit <= AUTOCOMPLETE_MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be 1-{AUTOCOMPLETE_MAX_LIMIT}")
+    kinds = [t.strip() for t in types.split(",") if t.strip()] if types else None
+    if kinds and not set(kinds) <= set(SUGGESTION_TYPES):
+        raise HTTPException(status_code=400, detail=f"types must be among: {', '.join(SUGGESTION_TYPES)}")
+    index = await get_autocomplete_index()
+    return {"suggestions": index.suggest(q, limit, kinds)}
+
+@api_router.get("/services/facets")
+async def get_service_facets(
+    category: Optional[str] = None,
+    location: Optional[str] = None,
+    search: Optional[str] = None,
+    fuzzy: bool = False,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None
+):
+    """
+    Counts per category, location, rating bucket and price bucket for the current
+    filter, in one round trip (one per SEARCH_IN_CHUNK text matches). The unfiltered
+    view is served from memory.
+    """
+    category, location, search = normalize_service_filters(category, location, search)
+    if not (category or location or search or min_price is not None or max_price is not None):
+        return format_counts(await service_facets.get())
+
+    query = services_query(category, location, min_price, max_price, None)
+    if search:
+        # Every text match is counted: one aggregation per chunk of ids, added up
+        ids = await search_candidate_ids(category, location, search, fuzzy)
+        if not ids:
+            return format_counts(empty_counts())
+        parts = await asyncio.gather(*(aggregate_facets({**query, "id": {"$in": chunk}}) for chunk in id_chunks(ids)))
+        return format_counts(sum_counts(parts))
+    return format_counts(await aggregate_facets(query))
 
 @api_router.post("/init-data")
 async def initialize_sample_data():
@@ -229,18 +516,27 @@ async def initialize_sample_data():
     if existing_services > 0:
         return {"message": "Sample data already exists"}
     sample_services = [
-        {"name": "Royal Palace Banquet Hall", "category": "venues", "description": "Elegant hall...", "price_range": "$5000 - $15000", "location": "Downtown", "rating": 4.8, "image_url": "https://images.unsplash.com/photo-1532712938310-34cb3982ef74", "contact_phone": "555-0101", "contact_email": "royal@palace.com", "availability": True},
-        {"name": "Gourmet Delights Catering", "category": "catering", "description": "Premium catering service", "price_range": "$50 - $150 per person", "location": "City Center", "rating": 4.6, "image_url": "https://images.unsplash.com/photo-1520854221256-17451cc331bf", "contact_phone": "555-0202", "contact_email": "info@gourmetdelights.com", "availability": True},
+        {"name": "Royal Palace Banquet Hall", "category": "venues", "description": "Elegant hall...", "price_range": "$5000 - $15000", "location": "Downtown", "rating": 4.8, "image_url": "https://images.unsplash.com/photo-1532712938310-34cb3982ef74", "contact_phone": "555-0101", "contact_email": "royal@palace.com", "availability": True, "geo": {"type": "Point", "coordinates": [-74.0060, 40.7128]}},
+        {"name": "Gourmet Delights Catering", "category": "catering", "description": "Premium catering service", "price_range": "$50 - $150 per person", "location": "City Center", "rating": 4.6, "image_url": "https://images.unsplash.com/photo-1520854221256-17451cc331bf", "contact_phone": "555-0202", "contact_email": "info@gourmetdelights.com", "availability": True, "geo": {"type": "Point", "coordinates": [-73.9855, 40.7580]}},
     ]
     for s in sample_services:
         s["id"] = str(uuid.uuid4())
         s["created_at"] = datetime.utcnow()
+        s["min_price"], s["max_price"], s["price_unit"] = parse_price_range(s["price_range"])
+        s["location_tokens"] = location_tokens(s["location"])
     await db.services.insert_many(sample_services)
+    invalidate_service_catalog()
+    for s in sample_services:
+        service_facets.apply(None, s)
     return {"message": "Sample data initialized successfully", "count": len(sample_services)}
 
 # --- Include Routers ---
 app.include_router(api_router)
-app.include_router(appointment_router)  # ✅ include payment route
+app.include_router(appointment_router)
+app.include_router(payment_router)  # ✅ include payment route
+app.include_router(service_import_router)
+app.include_router(export_router)
+app.include_router(review_router)
 
 # --- CORS Middleware ---
 app.add_middleware(
@@ -249,15 +545,68 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],  # readable by the frontend's fetch()
 )
 
+# --- gzip / brotli for large single-body responses ---
+app.add_middleware(CompressionMiddleware)
+
+# --- Request metrics (outermost, so it times everything) ---
+app.add_middleware(MetricsMiddleware)
+
 @app.get("/")
 def home():
     return {"message": "Backend is running!"}
 
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
+# Server error code for an existing index with the same keys but other options
+INDEX_OPTIONS_CONFLICT = 85
+
+@register_indexes
+async def ensure_service_indexes():
+    from pymongo.errors import OperationFailure
+
+    # Unique: imports upsert by id. Older deployments have it non-unique; that one is replaced
+    try:
+        await db.services.create_index("id", unique=True)
+    except OperationFailure as e:
+        if e.code != INDEX_OPTIONS_CONFLICT:
+            raise
+        await db.services.drop_index("id_1")
+        await db.services.create_index("id", unique=True)
+    await db.services.create_index([("availability", 1), ("category", 1)])
+    # ✅ "Near me" search ($geoNear needs exactly one 2dsphere index on services)
+    await db.services.create_index([("geo", "2dsphere"), ("availability", 1), ("category", 1)])
+    # ✅ Budget filters, price / rating sorts and newest-first browsing, with and without a category;
+    # the trailing `id` lets a cursor page resume with one range scan
+    await db.services.create_index([("availability", 1), ("category", 1), ("min_price", 1), ("id", 1)])
+    await db.services.create_index([("availability", 1), ("min_price", 1), ("id", 1)])
+    await db.services.create_index([("availability", 1), ("category", 1), ("rating", -1), ("id", 1)])
+    await db.services.create_index([("availability", 1), ("rating", -1), ("id", 1)])
+    await db.services.create_index([("availability", 1), ("category", 1), ("created_at", -1), ("id", -1)])
+    await db.services.create_index([("availability", 1), ("created_at", -1), ("id", -1)])
+    # ✅ Covers the facet aggregation's $match + $project (no document fetches)
+    await db.services.create_index([("availability", 1), ("category", 1), ("location", 1), ("rating", 1), ("min_price", 1)])
+    # ✅ Location filter (anchored prefix per token); `python -m backend.catalog` fills it in for older services
+    await db.services.create_index("location_tokens")
+
+@register_indexes
+async def ensure_user_indexes():
+    await db.users.create_index("id")
+    await db.users.create_index("email")
+
+@app.get("/api/db-stats")
+async def db_stats():
+    return {"pool": database.pool_stats()}
+
+@app.get("/api/metrics", response_class=PlainTextResponse)
+async def metrics():
+    from backend.db_monitoring import POOL_COUNTERS
+
+    gauges, counters = {}, {}
+    for key, value in database.pool_stats().items():
+        (counters if key in POOL_COUNTERS else gauges)[f"mongodb_pool_{key.removeprefix('pool_')}"] = value
+    gauges["availability_stream_subscribers"] = availability_broadcaster.subscriber_count()
+    return PlainTextResponse(render_metrics(gauges, counters), media_type="text/plain; version=0.0.4")
 
 @app.get("/api/ping")
 async def ping():
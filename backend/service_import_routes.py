@@ -0,0 +1,208 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from typing import Optional
+from pydantic import ValidationError
+import asyncio
+import csv
+import json
+import os
+from backend.auth import get_admin_user
+from backend.catalog import invalidate_service_catalog
+from backend.database import db, indexes_ready
+from backend.facets import service_facets
+from backend.models import Service, User
+from backend.search import location_tokens
+
+router = APIRouter(prefix="/api")
+
+# --- Import config ---
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+IMPORT_MAX_ERRORS = 1000
+IMPORT_MAX_LINE_BYTES = 1024 * 1024
+# Only written when a service is created; afterwards reviews own the rating
+INSERT_ONLY_FIELDS = ("created_at", "rating", "review_count")
+# Parsed from price_range, which every row has, so they are written even when None
+PRICE_FIELDS = ("min_price", "max_price", "price_unit")
+
+
+async def iter_lines(stream):
+    """
+    Split a streamed request body into decoded lines without buffering the whole body.
+    """
+    buffer = b""
+    async for chunk in stream:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        if len(buffer) > IMPORT_MAX_LINE_BYTES:
+            raise HTTPException(status_code=400, detail="Line too long")
+        for line in lines:
+            yield line.rstrip(b"\r").decode("utf-8")
+    if buffer:
+        yield buffer.rstrip(b"\r").decode("utf-8")
+
+
+async def iter_ndjson_rows(lines):
+    row_number = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row_number, None, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(row, dict):
+            yield row_number, None, "Each line must be a JSON object"
+            continue
+        yield row_number, row, None
+
+
+async def iter_csv_rows(lines):
+    """
+    CSV with a header row. A record whose quotes are still open continues on the
+    next line, so quoted fields may contain newlines.
+    """
+    header = None
+    pending = ""
+    row_number = 0
+    async for line in lines:
+        pending = f"{pending}\n{line}" if pending else line
+        if pending.count('"') % 2:
+            continue
+        record, pending = pending, ""
+        if not record.strip():
+            continue
+        values = next(csv.reader([record]))
+        if header is None:
+            header = [h.strip() for h in values]
+            continue
+        row_number += 1
+        if len(values) != len(header):
+            yield row_number, None, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        # Empty cells fall back to the model defaults
+        yield row_number, {k: v for k, v in zip(header, values) if v != ""}, None
+    if pending:
+        yield row_number + 1, None, "Unterminated quoted field"
+
+
+class ImportReport:
+    def __init__(self):
+        self.received = 0
+        self.inserted = 0
+        self.updated = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, row_number: int, error):
+        self.failed += 1
+        if len(self.errors) < IMPORT_MAX_ERRORS:
+            self.errors.append({"row": row_number, "error": error})
+
+    def as_dict(self):
+        return {
+            "received": self.received,
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+async def write_batch(batch, report: ImportReport):
+    """
+    Unordered upserts keyed by service id (unique, so concurrent imports of one id
+    can't create two services); one bad document doesn't stop the batch. Fields a
+    row leaves empty (e.g. no lat/lng) keep the stored value.
+    """
+    from pymongo import UpdateOne
+    from pymongo.errors import BulkWriteError
+
+    operations = [
+        UpdateOne(
+            {"id": doc["id"]},
+            {
+                "$set": {
+                    k: v for k, v in doc.items()
+                    if k not in INSERT_ONLY_FIELDS and (v is not None or k in PRICE_FIELDS)
+                },
+                "$setOnInsert": {k: doc[k] for k in INSERT_ONLY_FIELDS},
+            },
+            upsert=True,
+        )
+        for _, doc in batch
+    ]
+    try:
+        result = await db.services.bulk_write(operations, ordered=False)
+        report.inserted += result.upserted_count
+        report.updated += result.matched_count
+    except BulkWriteError as e:
+        details = e.details
+        report.inserted += details.get("nUpserted", 0)
+        report.updated += details.get("nMatched", 0)
+        for write_error in details.get("writeErrors", []):
+            report.add_error(batch[write_error["index"]][0], write_error.get("errmsg", "Write failed"))
+
+
+def validation_message(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in error.errors())
+
+
+@router.post("/services/import")
+async def import_services(
+    request: Request,
+    format: Optional[str] = None,
+    admin: User = Depends(get_admin_user)
+):
+    """
+    Bulk upsert services from an NDJSON or CSV body (format from `?format=` or the
+    Content-Type). Rows are validated against `Service` and written in unordered
+    batches while the body is still streaming in; invalid rows are reported, not fatal.
+    """
+    content_type = request.headers.get("content-type", "")
+    fmt = format or ("csv" if "csv" in content_type else "ndjson")
+    if fmt not in ("ndjson", "csv"):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'csv'")
+
+    await indexes_ready()
+    lines = iter_lines(request.stream())
+    rows = iter_csv_rows(lines) if fmt == "csv" else iter_ndjson_rows(lines)
+    report = ImportReport()
+    batch = []
+    # One batch is written while the next one is parsed
+    in_flight = None
+    try:
+        async for row_number, row, error in rows:
+            report.received += 1
+            if error:
+                report.add_error(row_number, error)
+                continue
+            try:
+                service = Service(**row)
+            except ValidationError as e:
+                report.add_error(row_number, validation_message(e))
+                continue
+            doc = service.dict()
+            doc["category"] = service.category.value
+            doc["location_tokens"] = location_tokens(service.location)
+            batch.append((row_number, doc))
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                if in_flight:
+                    await in_flight
+                in_flight = asyncio.ensure_future(write_batch(batch, report))
+                batch = []
+        if in_flight:
+            await in_flight
+            in_flight = None
+        if batch:
+            await write_batch(batch, report)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Body must be UTF-8 encoded")
+    finally:
+        if in_flight:
+            await in_flight
+        if report.inserted or report.updated:
+            invalidate_service_catalog()
+            service_facets.invalidate()
+    return report.as_dict()
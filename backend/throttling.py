@@ -0,0 +1,190 @@
+import inspect
+import math
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+from fastapi import HTTPException, Request
+from backend.database import register_indexes
+
+# --- Auth throttling config ---
+# Buckets refill continuously at `per_minute` and hold at most `burst` tokens
+AUTH_IP_BURST = int(os.environ.get("AUTH_IP_BURST", "20"))
+AUTH_IP_PER_MINUTE = float(os.environ.get("AUTH_IP_PER_MINUTE", "20"))
+AUTH_EMAIL_BURST = int(os.environ.get("AUTH_EMAIL_BURST", "5"))
+AUTH_EMAIL_PER_MINUTE = float(os.environ.get("AUTH_EMAIL_PER_MINUTE", "5"))
+RATE_LIMIT_BACKEND = os.environ.get("RATE_LIMIT_BACKEND", "memory")  # "memory" or "mongo"
+# Behind Vercel / a load balancer the client address comes from X-Forwarded-For. Each proxy
+# appends the address it saw, so only the last TRUSTED_PROXY_HOPS entries (those our own
+# proxies appended) can be believed; anything left of them is whatever the client sent.
+TRUST_PROXY_HEADERS = os.environ.get("TRUST_PROXY_HEADERS", "true" if os.environ.get("VERCEL") else "false").lower() == "true"
+TRUSTED_PROXY_HOPS = max(1, int(os.environ.get("TRUSTED_PROXY_HOPS", "1")))
+
+
+class TokenBucketLimiter:
+    """
+    In-memory token buckets keyed by string. A bucket that has refilled completely is
+    the same as no bucket, so each one is scheduled on a time wheel for the moment it
+    would be full again and dropped then; memory tracks only recently active keys.
+    """
+
+    def __init__(self, burst: int, per_minute: float, wheel_slots: int = 64, clock=time.monotonic):
+        self.burst = burst
+        self.rate = per_minute / 60.0
+        self.clock = clock
+        # key -> [tokens, updated_at, expires_at]
+        self.buckets: Dict[str, List[float]] = {}
+        self.wheel: List[Set[str]] = [set() for _ in range(wheel_slots)]
+        self.wheel_tick = math.floor(clock())
+
+    def __len__(self):
+        return len(self.buckets)
+
+    def _schedule(self, key: str, expires_at: float):
+        self.wheel[math.ceil(expires_at) % len(self.wheel)].add(key)
+
+    def _expire(self, now: float):
+        """
+        Advance the wheel one second at a time up to `now`. Keys that were re-armed
+        since they were slotted, or expire beyond one turn of the wheel, move on.
+        """
+        current = math.floor(now)
+        # After a long idle period every slot is due once; no need to spin through each second
+        if current - self.wheel_tick > len(self.wheel):
+            self.wheel_tick = current - len(self.wheel)
+        while self.wheel_tick < current:
+            self.wheel_tick += 1
+            slot = self.wheel[self.wheel_tick % len(self.wheel)]
+            if not slot:
+                continue
+            keys = list(slot)
+            slot.clear()
+            for key in keys:
+                bucket = self.buckets.get(key)
+                if bucket is None:
+                    continue
+                if bucket[2] <= now:
+                    del self.buckets[key]
+                elif math.ceil(bucket[2]) % len(self.wheel) == self.wheel_tick % len(self.wheel):
+                    # Due on a later turn of the wheel
+                    slot.add(key)
+
+    def hit(self, key: str, cost: float = 1.0) -> Tuple[bool, float]:
+        """
+        Take `cost` tokens from `key`'s bucket. Returns (allowed, retry_after_seconds).
+        """
+        now = self.clock()
+        self._expire(now)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            tokens = float(self.burst)
+        else:
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        expires_at = now + (self.burst - tokens) / self.rate if self.rate else math.inf
+        previous_expiry = bucket[2] if bucket else None
+        self.buckets[key] = [tokens, now, expires_at]
+        if previous_expiry is None or math.ceil(previous_expiry) != math.ceil(expires_at):
+            self._schedule(key, expires_at)
+        retry_after = 0.0 if allowed else (cost - tokens) / self.rate if self.rate else math.inf
+        return allowed, retry_after
+
+
+class MongoTokenBucketLimiter:
+    """
+    Same buckets, shared by every worker through the `rate_limits` collection. Each
+    hit is one atomic pipeline upsert; a TTL index drops buckets once they're full.
+    """
+
+    def __init__(self, name: str, burst: int, per_minute: float):
+        self.name = name
+        self.burst = burst
+        self.rate = per_minute / 60.0
+
+    async def hit(self, key: str, cost: float = 1.0) -> Tuple[bool, float]:
+        from pymongo import ReturnDocument
+        from pymongo.errors import DuplicateKeyError
+        from backend.database import db
+
+        now = datetime.utcnow()
+        elapsed_s = {"$divide": [{"$subtract": [now, {"$ifNull": ["$updated_at", now]}]}, 1000]}
+        pipeline = [
+            {"$set": {"tokens": {"$min": [self.burst, {"$add": [
+                {"$ifNull": ["$tokens", self.burst]}, {"$multiply": [elapsed_s, self.rate]},
+            ]}]}}},
+            {"$set": {"allowed": {"$gte": ["$tokens", cost]}}},
+            {"$set": {
+                "tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", cost]}, "$tokens"]},
+                "updated_at": now,
+                "expires_at": now + timedelta(seconds=self.burst / self.rate),
+            }},
+        ]
+        for attempt in range(2):
+            try:
+                bucket = await db.rate_limits.find_one_and_update(
+                    {"_id": f"{self.name}:{key}"}, pipeline, upsert=True,
+                    projection={"tokens": 1, "allowed": 1}, return_document=ReturnDocument.AFTER,
+                )
+                break
+            except DuplicateKeyError:
+                # Two first hits raced on the upsert; the second attempt updates the winner's doc
+                if attempt:
+                    raise
+        if bucket["allowed"]:
+            return True, 0.0
+        return False, (cost - bucket["tokens"]) / self.rate
+
+
+class AuthThrottle:
+    """
+    Per-IP and per-email buckets for one auth route, checked before any bcrypt or
+    Mongo work so a credential-stuffing burst is turned away with a cheap 429.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        if RATE_LIMIT_BACKEND == "mongo":
+            self.by_ip = MongoTokenBucketLimiter(f"{name}:ip", AUTH_IP_BURST, AUTH_IP_PER_MINUTE)
+            self.by_email = MongoTokenBucketLimiter(f"{name}:email", AUTH_EMAIL_BURST, AUTH_EMAIL_PER_MINUTE)
+        else:
+            self.by_ip = TokenBucketLimiter(AUTH_IP_BURST, AUTH_IP_PER_MINUTE)
+            self.by_email = TokenBucketLimiter(AUTH_EMAIL_BURST, AUTH_EMAIL_PER_MINUTE)
+
+    async def check(self, request: Request, email: Optional[str]):
+        for limiter, key in ((self.by_ip, client_ip(request)), (self.by_email, (email or "").strip().lower())):
+            if not key:
+                continue
+            result = limiter.hit(key)
+            allowed, retry_after = await result if inspect.isawaitable(result) else result
+            if not allowed:
+                raise HTTPException(
+                    status_code=429,
+                    detail="Too many attempts, try again later",
+                    headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+                )
+
+
+def client_ip(request: Request) -> str:
+    if TRUST_PROXY_HEADERS:
+        hops = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+        # The address our outermost trusted proxy saw, e.g. the rightmost hop behind one proxy
+        if len(hops) >= TRUSTED_PROXY_HOPS:
+            return hops[-TRUSTED_PROXY_HOPS]
+    return request.client.host if request.client else ""
+
+
+async def ensure_rate_limit_indexes():
+    from backend.database import db
+
+    await db.rate_limits.create_index("expires_at", expireAfterSeconds=0)
+
+
+if RATE_LIMIT_BACKEND == "mongo":
+    register_indexes(ensure_rate_limit_indexes)
+
+
+login_throttle = AuthThrottle("login")
+register_throttle = AuthThrottle("register")
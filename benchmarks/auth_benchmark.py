@@ -0,0 +1,69 @@
+"""
+Authenticated request throughput (GET /api/profile) with the user cache off, on,
+and with profile claims embedded in the token.
+
+Drives the app in-process, so it needs MONGO_URL / DB_NAME / JWT_SECRET pointing at
+a local MongoDB:
+
+    MONGO_URL=mongodb://localhost:27017 DB_NAME=bench JWT_SECRET=bench \
+        python -m benchmarks.auth_benchmark --requests 5000 --concurrency 50
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+
+from backend import auth, server
+from benchmarks.common import summarize
+
+
+async def hammer(client, token, total, concurrency):
+    samples = []
+    queue = iter(range(total))
+
+    async def worker():
+        headers = {"Authorization": f"Bearer {token}"}
+        for _ in queue:
+            t0 = time.perf_counter()
+            response = await client.get("/api/profile", headers=headers)
+            samples.append((time.perf_counter() - t0) * 1000)
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return total / (time.perf_counter() - started), summarize(samples)
+
+
+async def main(args):
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post("/api/register", json={
+            "name": "Bench User",
+            "email": f"bench-{uuid.uuid4().hex[:8]}@example.com",
+            "password": "BenchPass123!",
+        })
+        response.raise_for_status()
+        user = server.User(**response.json()["user"])
+
+        modes = [
+            ("cache off", 0, False),
+            ("cache on", auth.USER_CACHE_MAX_ENTRIES, False),
+            ("token claims", auth.USER_CACHE_MAX_ENTRIES, True),
+        ]
+        print(f"{'mode':<14} {'req/s':>9} {'p50_ms':>8} {'p99_ms':>8}")
+        for label, cache_size, embed_claims in modes:
+            auth.user_cache.clear()
+            auth.user_cache.maxsize = cache_size
+            auth.JWT_EMBED_USER_CLAIMS = embed_claims
+            token = auth.create_jwt_token(user)
+            rps, stats = await hammer(client, token, args.requests, args.concurrency)
+            print(f"{label:<14} {rps:>9.0f} {stats['p50_ms']:>8.2f} {stats['p99_ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,53 @@
+"""
+Typeahead latency vs. catalog size: every prefix of a few typed queries, one
+keystroke at a time, against the in-process autocomplete index, unfiltered and
+restricted to each suggestion type (/api/autocomplete?types=).
+
+    python -m benchmarks.autocomplete_benchmark --sizes 1000 10000 100000
+"""
+import argparse
+import time
+
+from backend.autocomplete import SUGGESTION_TYPES, AutocompleteIndex
+from benchmarks.common import generate_services, summarize
+
+TYPED = ["royal palace", "golden studio", "downtown", "photography", "lakeside", "glam beats", "harbour"]
+
+
+def run(size, limit):
+    index = AutocompleteIndex()
+    started = time.perf_counter()
+    for service in generate_services(size):
+        index.add(service)
+    index.refresh()
+    build_s = time.perf_counter() - started
+
+    samples, filtered = [], []
+    for _ in range(20):
+        for text in TYPED:
+            for end in range(1, len(text) + 1):
+                t0 = time.perf_counter()
+                index.suggest(text[:end], limit)
+                samples.append((time.perf_counter() - t0) * 1000)
+                for kind in SUGGESTION_TYPES:
+                    t0 = time.perf_counter()
+                    index.suggest(text[:end], limit, [kind])
+                    filtered.append((time.perf_counter() - t0) * 1000)
+    return build_s, summarize(samples), summarize(filtered)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'services':>10} {'build_s':>9} {'p50_ms':>9} {'p99_ms':>9} {'typed_p50':>10} {'typed_p99':>10}")
+    for size in args.sizes:
+        build_s, stats, typed = run(size, args.limit)
+        print(f"{size:>10} {build_s:>9.2f} {stats['p50_ms']:>9.3f} {stats['p99_ms']:>9.3f} "
+              f"{typed['p50_ms']:>10.3f} {typed['p99_ms']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
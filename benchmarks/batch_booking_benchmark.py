@@ -0,0 +1,109 @@
+"""
+Books the same "weddings" (N services on one date each) two ways and compares them:
+N sequential POST /api/book-appointment calls versus one POST /api/book-appointments.
+Also checks that a batch overlapping a taken slot is a 409 naming that slot and
+stores nothing.
+
+    MONGO_URL=mongodb://localhost:27017/?replicaSet=rs0 DB_NAME=bench JWT_SECRET=bench \
+        python -m benchmarks.batch_booking_benchmark --weddings 200 --services 6
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import date, datetime, timedelta
+
+import httpx
+
+from backend import server
+from backend.appointment_routes import ensure_appointment_indexes
+from benchmarks.common import generate_services, summarize
+
+
+async def sequential(client, service_ids, day, email):
+    for service_id in service_ids:
+        response = await client.post("/api/book-appointment", json={
+            "service_id": service_id, "appointment_date": day.isoformat(), "email": email,
+        })
+        response.raise_for_status()
+
+
+async def batched(client, service_ids, day, email):
+    response = await client.post("/api/book-appointments", json={
+        "email": email,
+        "payment_id": f"bench-{uuid.uuid4()}",
+        "slots": [{"service_id": service_id, "appointment_date": day.isoformat()} for service_id in service_ids],
+    })
+    response.raise_for_status()
+
+
+async def run(client, book, service_ids, days, concurrency):
+    samples = []
+    queue = iter(days)
+
+    async def worker():
+        for day in queue:
+            t0 = time.perf_counter()
+            await book(client, service_ids, day, "bench@example.com")
+            samples.append((time.perf_counter() - t0) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(samples), time.perf_counter() - started
+
+
+async def main(args):
+    await ensure_appointment_indexes()
+    services = []
+    for service in generate_services(args.services, seed=uuid.uuid4().int):
+        service["availability"] = True
+        services.append(service)
+    service_ids = [s["id"] for s in services]
+    await server.db.services.insert_many([dict(s) for s in services])
+
+    # Disjoint date ranges so the two runs never collide
+    first = date(2031, 1, 1)
+    sequential_days = [first + timedelta(days=i) for i in range(args.weddings)]
+    batched_days = [first + timedelta(days=args.weddings + i) for i in range(args.weddings)]
+
+    transport = httpx.ASGITransport(app=server.app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            results = {
+                "sequential": await run(client, sequential, service_ids, sequential_days, args.concurrency),
+                "batched": await run(client, batched, service_ids, batched_days, args.concurrency),
+            }
+
+            # One already-taken slot sinks the whole batch, and is the one reported
+            taken_day = batched_days[0]
+            fresh_day = batched_days[-1] + timedelta(days=1)
+            response = await client.post("/api/book-appointments", json={"slots": [
+                {"service_id": service_ids[0], "appointment_date": fresh_day.isoformat()},
+                {"service_id": service_ids[-1], "appointment_date": taken_day.isoformat()},
+            ]})
+            assert response.status_code == 409, response.text
+            assert response.json()["detail"]["conflicts"] == [
+                {"service_id": service_ids[-1], "appointment_date": taken_day.isoformat()}
+            ], response.text
+            leaked = await server.db.appointments.count_documents({
+                "service_id": service_ids[0], "appointment_date": datetime.combine(fresh_day, datetime.min.time()),
+            })
+            assert leaked == 0, "a rejected batch left appointments behind"
+    finally:
+        await server.db.appointments.delete_many({"service_id": {"$in": service_ids}})
+        await server.db.services.delete_many({"id": {"$in": service_ids}})
+
+    slots = args.weddings * args.services
+    print(f"{args.weddings} weddings x {args.services} services, concurrency {args.concurrency}")
+    print(f"{'mode':<11} {'slots/s':>9} {'p50_ms':>8} {'p95_ms':>8} {'p99_ms':>8}")
+    for mode, (stats, elapsed) in results.items():
+        print(f"{mode:<11} {slots / elapsed:>9.1f} {stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f}")
+    print("conflicting batch: 409 with the taken slot, nothing stored")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--weddings", type=int, default=200)
+    parser.add_argument("--services", type=int, default=6)
+    parser.add_argument("--concurrency", type=int, default=8)
+    asyncio.run(main(parser.parse_args()))
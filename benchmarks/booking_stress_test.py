@@ -0,0 +1,48 @@
+"""
+Fires many simultaneous bookings for one (service_id, date) slot and asserts that
+exactly one succeeds and every other request gets the "already booked" 400.
+
+    MONGO_URL=mongodb://localhost:27017 DB_NAME=bench JWT_SECRET=bench \
+        python -m benchmarks.booking_stress_test --bookings 5000
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+
+from backend import server
+from backend.appointment_routes import ensure_appointment_indexes
+
+
+async def main(args):
+    await ensure_appointment_indexes()
+    service_id = f"stress-{uuid.uuid4()}"
+    payload = {"service_id": service_id, "appointment_date": "2030-06-15"}
+
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(
+            client.post("/api/book-appointment", json={**payload, "email": f"guest{i}@example.com"})
+            for i in range(args.bookings)
+        ))
+        elapsed = time.perf_counter() - started
+
+    statuses = {}
+    for response in responses:
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+    stored = await server.db.appointments.count_documents({"service_id": service_id})
+    await server.db.appointments.delete_many({"service_id": service_id})
+
+    print(f"{args.bookings} bookings in {elapsed:.2f}s -> {statuses}, stored={stored}")
+    assert statuses.get(200) == 1, f"expected exactly one winner, got {statuses}"
+    assert statuses.get(400) == args.bookings - 1, f"unexpected responses: {statuses}"
+    assert stored == 1, f"expected one stored appointment, found {stored}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bookings", type=int, default=2000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,69 @@
+"""
+Shared helpers for the benchmark scripts: synthetic catalog data and latency stats.
+"""
+import random
+import statistics
+import uuid
+from datetime import datetime
+
+from backend.search import location_tokens
+
+CATEGORIES = ["venues", "catering", "decoration", "photography", "makeup", "dj", "transport", "gifts"]
+LOCATIONS = ["Downtown", "City Center", "Old Town", "Riverside", "North Hills", "Lakeside", "Airport Road", "Harbour Front"]
+NAME_WORDS = [
+    "Royal", "Palace", "Golden", "Elegant", "Classic", "Grand", "Dream", "Blossom", "Silver", "Heritage",
+    "Banquet", "Gardens", "Studio", "Lens", "Beats", "Rides", "Glam", "Feast", "Delights", "Events",
+]
+DESCRIPTION_WORDS = [
+    "premium", "wedding", "service", "elegant", "hall", "catering", "floral", "decor", "photography", "candid",
+    "bridal", "makeup", "music", "lighting", "luxury", "cars", "custom", "gifts", "buffet", "outdoor",
+]
+
+# Long tail of vendor-specific words so term frequencies follow a Zipf-like curve
+TAIL_WORDS = [f"{prefix}{suffix}" for prefix in ("ar", "be", "ca", "do", "el", "fa", "gi", "ho", "in", "ja")
+              for suffix in ("mora", "lisk", "vent", "tora", "quin", "dell", "rosa", "nami", "pixa", "tune",
+                             "wood", "hart", "ster", "vale", "more", "ford", "leaf", "lane", "rock", "mint")]
+TAIL_WEIGHTS = [1 / rank for rank in range(1, len(TAIL_WORDS) + 1)]
+
+
+def generate_services(count, seed=42):
+    rng = random.Random(seed)
+    for _ in range(count):
+        low = rng.randrange(50, 10000, 50)
+        location = rng.choice(LOCATIONS)
+        yield {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "name": " ".join(rng.sample(NAME_WORDS, 3)),
+            "category": rng.choice(CATEGORIES),
+            "description": " ".join(rng.choices(DESCRIPTION_WORDS, k=4) + rng.choices(TAIL_WORDS, TAIL_WEIGHTS, k=8)),
+            "price_range": f"${low} - ${low * 3}",
+            "min_price": float(low),
+            "max_price": float(low * 3),
+            "price_unit": "event",
+            "location": location,
+            "location_tokens": location_tokens(location),
+            "rating": round(rng.uniform(3.0, 5.0), 1),
+            "image_url": "https://images.unsplash.com/photo-1532712938310-34cb3982ef74",
+            "contact_phone": "555-0101",
+            "contact_email": "vendor@example.com",
+            "availability": rng.random() > 0.1,
+            "created_at": datetime.utcnow(),
+        }
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    k = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[k]
+
+
+def summarize(samples_ms):
+    return {
+        "count": len(samples_ms),
+        "mean_ms": round(statistics.fmean(samples_ms), 3) if samples_ms else 0.0,
+        "p50_ms": round(percentile(samples_ms, 50), 3),
+        "p95_ms": round(percentile(samples_ms, 95), 3),
+        "p99_ms": round(percentile(samples_ms, 99), 3),
+    }
@@ -0,0 +1,90 @@
+"""
+"Near me" latency vs. catalog size: $geoNear on the 2dsphere index (what
+GET /api/services?lat=&lng= runs) against an unindexed $geoWithin scan.
+
+Seeds services into the configured database, so point it at a scratch DB_NAME:
+
+    MONGO_URL=mongodb://localhost:27017 DB_NAME=bench JWT_SECRET=bench \
+        python -m benchmarks.geo_benchmark --sizes 10000 100000 1000000
+"""
+import argparse
+import asyncio
+import math
+import random
+import time
+
+from backend.database import db
+from backend.server import ensure_service_indexes, find_services_near
+from benchmarks.common import CATEGORIES, generate_services, summarize
+
+ID_PREFIX = "geo-bench-"
+CENTER = (40.7128, -74.0060)
+SPREAD_DEG = 1.0  # roughly a 110 km box around the center
+EARTH_RADIUS_KM = 6378.1
+
+
+def random_point(rng):
+    return CENTER[0] + rng.uniform(-SPREAD_DEG, SPREAD_DEG), CENTER[1] + rng.uniform(-SPREAD_DEG, SPREAD_DEG)
+
+
+async def seed(size, batch=10000):
+    rng = random.Random(size)
+    docs = []
+    for n, service in enumerate(generate_services(size, seed=size)):
+        lat, lng = random_point(rng)
+        docs.append({**service, "id": f"{ID_PREFIX}{n}", "geo": {"type": "Point", "coordinates": [lng, lat]}})
+        if len(docs) >= batch:
+            await db.services.insert_many(docs, ordered=False)
+            docs = []
+    if docs:
+        await db.services.insert_many(docs, ordered=False)
+
+
+async def scan_near(near, category):
+    lat, lng, radius_km = near
+    query = {
+        "availability": True,
+        "geo": {"$geoWithin": {"$centerSphere": [[lng, lat], radius_km / EARTH_RADIUS_KM]}},
+    }
+    if category:
+        query["category"] = category
+    return await db.services.find(query, {"_id": 0}).hint([("$natural", 1)]).to_list(None)
+
+
+async def measure(fn, queries):
+    samples = []
+    for near, category in queries:
+        started = time.perf_counter()
+        await fn(near, category)
+        samples.append((time.perf_counter() - started) * 1000)
+    return summarize(samples)
+
+
+async def main(args):
+    await ensure_service_indexes()
+    print(f"{'services':>10} {'radius_km':>9} {'geoNear p50':>12} {'p99':>8} {'scan p50':>10} {'p99':>8}")
+    for size in args.sizes:
+        await db.services.delete_many({"id": {"$regex": f"^{ID_PREFIX}"}})
+        await seed(size)
+        rng = random.Random(1)
+        for radius_km in args.radius_km:
+            queries = [
+                ((*random_point(rng), radius_km), rng.choice(CATEGORIES) if rng.random() < 0.5 else None)
+                for _ in range(args.queries)
+            ]
+            indexed = await measure(lambda near, category: find_services_near(category, None, None, False, near), queries)
+            line = f"{size:>10} {radius_km:>9g} {indexed['p50_ms']:>12.2f} {indexed['p99_ms']:>8.2f}"
+            if size <= args.scan_max_size:
+                scanned = await measure(scan_near, queries[:max(1, math.ceil(args.queries / 10))])
+                line += f" {scanned['p50_ms']:>10.2f} {scanned['p99_ms']:>8.2f}"
+            print(line)
+    await db.services.delete_many({"id": {"$regex": f"^{ID_PREFIX}"}})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--radius-km", type=float, nargs="+", default=[2, 10, 50])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--scan-max-size", type=int, default=100_000, help="skip the unindexed scan above this size")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,68 @@
+"""
+Cold-start guard for the serverless entry point. Imports api/index.py in fresh
+interpreters with `python -X importtime`, reports the slowest modules and exits
+non-zero when the median import time exceeds the budget.
+
+    python -m benchmarks.import_time --budget-ms 800 --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+TARGET = "api.index"
+FORBIDDEN_AT_IMPORT = ("motor", "pymongo", "bcrypt")
+
+
+def measure_once():
+    env = {
+        **os.environ,
+        "MONGO_URL": os.environ.get("MONGO_URL", "mongodb://localhost:27017"),
+        "DB_NAME": os.environ.get("DB_NAME", "import_time"),
+        "JWT_SECRET": os.environ.get("JWT_SECRET", "import-time"),
+    }
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {TARGET}"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, self_us, cumulative_us, name = (part.strip() for part in line.replace("import time:", "|", 1).split("|"))
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget-ms", type=float, default=float(os.environ.get("IMPORT_TIME_BUDGET_MS", "1000")))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    runs = [measure_once() for _ in range(args.runs)]
+    totals_ms = [run[TARGET][1] / 1000 for run in runs]
+    median_ms = statistics.median(totals_ms)
+
+    last = runs[-1]
+    print("Slowest imports (cumulative, last run):")
+    for name, (_, cumulative) in sorted(last.items(), key=lambda item: item[1][1], reverse=True)[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    eager = sorted({name.split(".")[0] for name in last} & set(FORBIDDEN_AT_IMPORT))
+    print(f"\n{TARGET}: median {median_ms:.1f} ms over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+    if eager:
+        print(f"FAIL: imported eagerly but should be deferred: {', '.join(eager)}")
+        sys.exit(1)
+    if median_ms > args.budget_ms:
+        print("FAIL: cold-start import time is over budget")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
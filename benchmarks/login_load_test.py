@@ -0,0 +1,78 @@
+"""
+Checks that browsing stays responsive during a login spike: measures GET /api/services
+latency on its own, then again while concurrent logins keep the bcrypt pool busy.
+
+    MONGO_URL=mongodb://localhost:27017 DB_NAME=bench JWT_SECRET=bench \
+        python -m benchmarks.login_load_test --logins 200 --login-concurrency 32
+"""
+import argparse
+import asyncio
+import os
+import time
+import uuid
+
+import httpx
+
+# Every simulated client shares one address; lift the auth throttle so the load reaches bcrypt
+os.environ.setdefault("AUTH_IP_BURST", "1000000")
+os.environ.setdefault("AUTH_EMAIL_BURST", "1000000")
+
+from backend import server
+from benchmarks.common import summarize
+
+
+async def browse(client, requests, concurrency):
+    samples = []
+    queue = iter(range(requests))
+
+    async def worker():
+        for i in queue:
+            t0 = time.perf_counter()
+            # Vary the query so the response cache doesn't hide the event loop stalls
+            response = await client.get("/api/services", params={"search": f"hall{i % 7}"})
+            samples.append((time.perf_counter() - t0) * 1000)
+            response.raise_for_status()
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(samples)
+
+
+async def login_storm(client, credentials, logins, concurrency):
+    statuses = {}
+    queue = iter(range(logins))
+
+    async def worker():
+        for _ in queue:
+            response = await client.post("/api/login", json=credentials)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return statuses
+
+
+async def main(args):
+    server.services_cache.maxsize = 0
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        await client.post("/api/init-data")
+        credentials = {"email": f"load-{uuid.uuid4().hex[:8]}@example.com", "password": "LoadPass123!"}
+        (await client.post("/api/register", json={"name": "Load User", **credentials})).raise_for_status()
+
+        idle = await browse(client, args.browse_requests, args.browse_concurrency)
+        storm = asyncio.create_task(login_storm(client, credentials, args.logins, args.login_concurrency))
+        busy = await browse(client, args.browse_requests, args.browse_concurrency)
+        statuses = await storm
+
+    print(f"{'phase':<14} {'p50_ms':>8} {'p95_ms':>8} {'p99_ms':>8}")
+    for label, stats in (("idle", idle), ("during logins", busy)):
+        print(f"{label:<14} {stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f}")
+    print(f"login responses: {statuses}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--browse-requests", type=int, default=2000)
+    parser.add_argument("--browse-concurrency", type=int, default=20)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--login-concurrency", type=int, default=32)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,81 @@
+"""
+Checkout throughput against the local payment simulator, including the retry path.
+Every checkout retries on 409/503 with the same idempotency key; afterwards the script
+asserts that no key was charged (stored) more than once.
+
+    MONGO_URL=mongodb://localhost:27017 DB_NAME=bench JWT_SECRET=bench \
+        python -m benchmarks.payment_load_test --checkouts 2000 --error-rate 0.2 --latency-ms 50
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+
+from backend import server
+from backend.fake_stripe_routes import ensure_payment_indexes
+from backend.payment_gateway import SimulatedGateway, set_payment_gateway
+from benchmarks.common import summarize
+
+
+async def checkout(client, run_id, n, max_attempts, samples, outcomes):
+    key = f"{run_id}-{n}"
+    started = time.perf_counter()
+    for attempt in range(1, max_attempts + 1):
+        response = await client.post(
+            "/api/create-fake-payment",
+            json={"amount": 1000 + n, "email": f"buyer{n}@example.com", "service_id": "bench"},
+            headers={"Idempotency-Key": key},
+        )
+        if response.status_code not in (409, 503):
+            break
+        await asyncio.sleep(0.01 * attempt)
+    samples.append((time.perf_counter() - started) * 1000)
+    label = f"{response.status_code}" + (" (after retry)" if attempt > 1 else "")
+    outcomes[label] = outcomes.get(label, 0) + 1
+
+
+async def main(args):
+    await ensure_payment_indexes()
+    set_payment_gateway(SimulatedGateway(
+        latency_ms=args.latency_ms, jitter_ms=args.latency_ms / 2,
+        decline_rate=args.decline_rate, error_rate=args.error_rate, seed=1,
+    ))
+    run_id = f"bench-{uuid.uuid4().hex[:8]}"
+    samples, outcomes = [], {}
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def limited(n):
+        async with semaphore:
+            await checkout(client, run_id, n, args.max_attempts, samples, outcomes)
+
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(limited(n) for n in range(args.checkouts)))
+        elapsed = time.perf_counter() - started
+
+    duplicates = await server.db.payments.aggregate([
+        {"$match": {"idempotency_key": {"$regex": f"^{run_id}-"}}},
+        {"$group": {"_id": "$idempotency_key", "n": {"$sum": 1}}},
+        {"$match": {"n": {"$gt": 1}}},
+    ]).to_list(None)
+    await server.db.payments.delete_many({"idempotency_key": {"$regex": f"^{run_id}-"}})
+
+    stats = summarize(samples)
+    print(f"{args.checkouts} checkouts in {elapsed:.2f}s ({args.checkouts / elapsed:.0f}/s)")
+    print(f"latency incl. retries: p50 {stats['p50_ms']:.1f} ms, p95 {stats['p95_ms']:.1f} ms, p99 {stats['p99_ms']:.1f} ms")
+    print(f"outcomes: {outcomes}")
+    assert not duplicates, f"{len(duplicates)} idempotency keys were stored more than once"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--checkouts", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--decline-rate", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.1)
+    parser.add_argument("--max-attempts", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
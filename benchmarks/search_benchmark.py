@@ -0,0 +1,63 @@
+"""
+Search latency vs. catalog size for the in-process services index.
+
+    python -m benchmarks.search_benchmark --sizes 1000 10000 100000 1000000
+"""
+import argparse
+import random
+import time
+
+from backend.search import ServiceSearchIndex
+from benchmarks.common import CATEGORIES, LOCATIONS, generate_services, summarize
+
+QUERIES = [
+    {"text": "royal"},
+    {"text": "wedding photography"},
+    {"text": "gard", "location": "Old"},
+    {"text": "elegnt", "fuzzy": True},
+    {"text": "premium buffet", "category": "catering"},
+    {"location": "City Center"},
+]
+
+
+def run(size, iterations, seed=7):
+    index = ServiceSearchIndex()
+    started = time.perf_counter()
+    for service in generate_services(size):
+        index.add(service)
+    build_s = time.perf_counter() - started
+
+    # Warm the lazily built impact-ordered posting lists, as steady-state traffic would
+    for query in QUERIES:
+        query = dict(query)
+        index.search(query.pop("text", None), limit=100, **query)
+
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(iterations):
+        query = dict(rng.choice(QUERIES))
+        if rng.random() < 0.3:
+            query.setdefault("category", rng.choice(CATEGORIES))
+        if rng.random() < 0.2:
+            query.setdefault("location", rng.choice(LOCATIONS))
+        text = query.pop("text", None)
+        t0 = time.perf_counter()
+        index.search(text, limit=100, **query)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return build_s, summarize(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'services':>10} {'build_s':>9} {'p50_ms':>9} {'p99_ms':>9}")
+    for size in args.sizes:
+        build_s, stats = run(size, args.iterations)
+        print(f"{size:>10} {build_s:>9.2f} {stats['p50_ms']:>9.3f} {stats['p99_ms']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
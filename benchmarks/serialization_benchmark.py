@@ -0,0 +1,68 @@
+"""
+Serialization cost of the GET /api/services body per 1k services: the old path
+(full documents, Service(**doc), jsonable_encoder, json.dumps) against the current
+one (projected documents, one TypeAdapter validation, orjson), plus compression.
+
+    python -m benchmarks.serialization_benchmark --size 1000 --iterations 50
+"""
+import argparse
+import json
+import time
+
+from fastapi.encoders import jsonable_encoder
+
+from backend.compression import brotli, compress
+from backend.models import Service
+from backend.server import SERVICE_RESPONSE_PROJECTION, encode_services, service_list_adapter
+from benchmarks.common import generate_services, summarize
+
+
+def full_documents(size):
+    # What find() returned before projections: the stored document including _id
+    return [{"_id": f"{i:024x}", **doc} for i, doc in enumerate(generate_services(size))]
+
+
+def legacy_encode(docs):
+    services = [Service(**doc) for doc in docs]
+    # FastAPI's response_model=List[Service] validated every item a second time
+    services = [Service.model_validate(s.model_dump()) for s in services]
+    return json.dumps(jsonable_encoder(services), separators=(",", ":")).encode("utf-8")
+
+
+def current_encode(docs):
+    return encode_services(service_list_adapter.validate_python(docs))
+
+
+def timed(fn, arg, iterations):
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        result = fn(arg)
+        samples.append((time.perf_counter() - started) * 1000)
+    return result, summarize(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    docs = full_documents(args.size)
+    projected = [{k: v for k, v in doc.items() if k in SERVICE_RESPONSE_PROJECTION} for doc in docs]
+
+    legacy_body, legacy = timed(legacy_encode, docs, args.iterations)
+    body, current = timed(current_encode, projected, args.iterations)
+    assert json.loads(body) == json.loads(legacy_body), "encoders disagree"
+
+    scale = 1000 / args.size
+    print(f"{'path':<28} {'p50_ms/1k':>10} {'p95_ms/1k':>10} {'bytes':>10}")
+    print(f"{'legacy (validate x2, json)':<28} {legacy['p50_ms'] * scale:>10.2f} {legacy['p95_ms'] * scale:>10.2f} {len(legacy_body):>10}")
+    print(f"{'projection + orjson':<28} {current['p50_ms'] * scale:>10.2f} {current['p95_ms'] * scale:>10.2f} {len(body):>10}")
+    for encoding in ("gzip", "br") if brotli is not None else ("gzip",):
+        compressed, stats = timed(lambda b: compress(b, encoding), body, args.iterations)
+        print(f"{'+ ' + encoding:<28} {stats['p50_ms'] * scale:>10.2f} {stats['p95_ms'] * scale:>10.2f} {len(compressed):>10}")
+
+
+if __name__ == "__main__":
+    main()
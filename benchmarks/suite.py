@@ -0,0 +1,201 @@
+"""
+Concurrent load/benchmark suite for the API.
+
+Drives the FastAPI app in-process over an ASGI transport (default), or a running
+server with --base-url, against a local MongoDB (MONGO_URL / DB_NAME / JWT_SECRET).
+Reports throughput and p50/p95/p99 latency per route, stores baselines and fails
+when a run regresses past the tolerance.
+
+    python -m benchmarks.suite                                  # all workloads, print results
+    python -m benchmarks.suite --workloads search booking       # a subset
+    python -m benchmarks.suite --save-baseline                  # record benchmarks/baselines.json
+    python -m benchmarks.suite --compare --tolerance 0.25       # exit 1 on regression
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+
+import httpx
+
+from benchmarks.common import CATEGORIES, LOCATIONS, summarize
+
+BASELINE_PATH = Path(__file__).parent / "baselines.json"
+SEARCH_TERMS = ["royal", "catering", "hall", "premium", "photo", "elegant", "banquet", "gourmet"]
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = {}
+        self.errors = {}
+        self.elapsed = {}
+
+    async def call(self, client, method, route, url, **kwargs):
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.samples.setdefault(route, []).append((time.perf_counter() - started) * 1000)
+        if response.status_code >= 500:
+            self.errors[route] = self.errors.get(route, 0) + 1
+        return response
+
+    def results(self):
+        results = {}
+        for route, samples in self.samples.items():
+            stats = summarize(samples)
+            stats["rps"] = round(len(samples) / self.elapsed[route], 1) if self.elapsed.get(route) else 0.0
+            stats["errors"] = self.errors.get(route, 0)
+            results[route] = stats
+        return results
+
+
+# --- Workloads ---
+async def auth_workload(client, recorder, n, rng, run_id):
+    email = f"{run_id}-{n}@example.com"
+    credentials = {"email": email, "password": "BenchPass123!"}
+    await recorder.call(client, "POST", "POST /api/register", "/api/register", json={"name": f"Bench {n}", **credentials})
+    await recorder.call(client, "POST", "POST /api/login", "/api/login", json=credentials)
+
+
+async def search_workload(client, recorder, n, rng, run_id):
+    params = {}
+    if rng.random() < 0.7:
+        params["search"] = rng.choice(SEARCH_TERMS)
+    if rng.random() < 0.3:
+        params["category"] = rng.choice(CATEGORIES)
+    if rng.random() < 0.2:
+        params["location"] = rng.choice(LOCATIONS)
+    await recorder.call(client, "GET", "GET /api/services", "/api/services", params=params)
+
+
+async def booking_workload(client, recorder, n, rng, run_id):
+    day = date(2031, 1, 1) + timedelta(days=rng.randrange(365))
+    payload = {"service_id": f"{run_id}-svc-{rng.randrange(50)}", "appointment_date": day.isoformat(), "email": f"{run_id}@example.com"}
+    await recorder.call(client, "POST", "POST /api/book-appointment", "/api/book-appointment", json=payload)
+    await recorder.call(client, "GET", "GET /api/booked-dates/{service_id}", f"/api/booked-dates/{payload['service_id']}")
+
+
+async def payment_workload(client, recorder, n, rng, run_id):
+    await recorder.call(
+        client, "POST", "POST /api/create-fake-payment", "/api/create-fake-payment",
+        json={"amount": 500 + n, "email": f"{run_id}@example.com", "service_id": f"{run_id}-svc"},
+        headers={"Idempotency-Key": f"{run_id}-pay-{n}"},
+    )
+
+
+WORKLOADS = {
+    "auth": auth_workload,
+    "search": search_workload,
+    "booking": booking_workload,
+    "payments": payment_workload,
+}
+
+
+async def run_workload(client, recorder, name, requests, concurrency, seed, run_id):
+    rng = random.Random(seed)
+    counter = iter(range(requests))
+    before = set(recorder.samples)
+
+    async def worker():
+        for n in counter:
+            await WORKLOADS[name](client, recorder, n, rng, run_id)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    for route in set(recorder.samples) - before:
+        recorder.elapsed[route] = elapsed
+
+
+@contextlib.asynccontextmanager
+async def make_client(base_url):
+    if base_url:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+            yield client
+        return
+    # Every simulated client shares one address; lift the auth throttle so the load reaches bcrypt
+    os.environ.setdefault("AUTH_IP_BURST", "1000000")
+    os.environ.setdefault("AUTH_EMAIL_BURST", "1000000")
+    from backend import server
+    from backend.payment_gateway import SimulatedGateway, set_payment_gateway
+
+    set_payment_gateway(SimulatedGateway(seed=1))
+    async with server.app.router.lifespan_context(server.app):
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            yield client
+
+
+async def cleanup(run_id):
+    from backend.database import db
+
+    pattern = {"$regex": f"^{run_id}"}
+    await db.users.delete_many({"email": pattern})
+    await db.appointments.delete_many({"service_id": pattern})
+    await db.payments.delete_many({"idempotency_key": pattern})
+
+
+# --- Baselines ---
+def compare(results, baseline, tolerance):
+    regressions = []
+    for route, stats in results.items():
+        base = baseline.get(route)
+        if not base:
+            continue
+        if stats["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{route}: p95 {stats['p95_ms']:.2f} ms vs baseline {base['p95_ms']:.2f} ms")
+        if base["rps"] and stats["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{route}: {stats['rps']:.0f} req/s vs baseline {base['rps']:.0f} req/s")
+    return regressions
+
+
+def print_results(results):
+    print(f"{'route':<36} {'n':>6} {'req/s':>8} {'p50_ms':>8} {'p95_ms':>8} {'p99_ms':>8} {'5xx':>5}")
+    for route, s in sorted(results.items()):
+        print(f"{route:<36} {s['count']:>6} {s['rps']:>8.0f} {s['p50_ms']:>8.2f} {s['p95_ms']:>8.2f} {s['p99_ms']:>8.2f} {s['errors']:>5}")
+
+
+async def main(args):
+    recorder = Recorder()
+    run_id = f"bench-{uuid.uuid4().hex[:8]}"
+    async with make_client(args.base_url) as client:
+        await client.post("/api/init-data")
+        for i, name in enumerate(args.workloads):
+            await run_workload(client, recorder, name, args.requests, args.concurrency, args.seed + i, run_id)
+    if not args.base_url:
+        await cleanup(run_id)
+
+    results = recorder.results()
+    print_results(results)
+
+    if args.save_baseline:
+        BASELINE_PATH.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+        print(f"\nSaved baseline to {BASELINE_PATH}")
+    if args.compare:
+        if not BASELINE_PATH.exists():
+            print(f"\nNo baseline at {BASELINE_PATH}; run with --save-baseline first")
+            sys.exit(1)
+        regressions = compare(results, json.loads(BASELINE_PATH.read_text()), args.tolerance)
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+        print("\nNo regressions against baseline")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workloads", nargs="+", choices=sorted(WORKLOADS), default=list(WORKLOADS))
+    parser.add_argument("--requests", type=int, default=500, help="operations per workload")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--base-url", help="benchmark a running server instead of the in-process app")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,6 @@
+import os
+
+# The app reads these at import time; tests that need a live MongoDB also need MONGO_URL
+os.environ.setdefault("JWT_SECRET", "test-secret")
+os.environ.setdefault("FAST_START", "true")
+os.environ.setdefault("DB_NAME", "wedding_planner_test")
@@ -0,0 +1,43 @@
+import pytest
+
+from backend.autocomplete import AutocompleteIndex, phrase_keys
+
+
+@pytest.fixture
+def index():
+    index = AutocompleteIndex()
+    index.add({"id": "1", "name": "Royal Palace Hall", "category": "venues", "location": "Downtown", "rating": 4.5})
+    index.add({"id": "2", "name": "Palace Photography", "category": "photography", "location": "Old Town", "rating": 4.9})
+    index.add({"id": "3", "name": "Royal Palace Hall", "category": "venues", "location": "Downtown", "rating": 4.8})
+    index.add({"id": "4", "name": "Closed Palace", "category": "venues", "location": "Downtown", "availability": False})
+    return index
+
+
+def test_phrase_keys():
+    assert phrase_keys("Royal  Palace Hall") == ["royal palace hall", "palace hall", "hall"]
+
+
+def test_phrase_starts_come_first_then_rating(index):
+    texts = [s["text"] for s in index.suggest("pal")]
+    assert texts == ["Palace Photography", "Royal Palace Hall"]
+
+
+def test_same_name_shows_once_as_best_rated(index):
+    assert index.suggest("royal") == [{"type": "service", "text": "Royal Palace Hall", "id": "3"}]
+
+
+def test_types_filter(index):
+    assert index.suggest("d", types=["location"]) == [{"type": "location", "text": "Downtown", "count": 2}]
+    assert all(s["type"] == "category" for s in index.suggest("p", types=["category"]))
+
+
+def test_set_weight_reranks_in_place(index):
+    index.refresh()
+    index.set_weight(("service", "1"), 5.0)
+    assert index.suggest("royal")[0]["id"] == "1"
+
+
+def test_remove(index):
+    index.remove("2")
+    assert index.suggest("photo") == []
+    assert index.suggest("") == []
@@ -0,0 +1,15 @@
+import base64
+from datetime import date
+
+from backend.appointment_routes import encode_bitmap
+
+
+def test_one_bit_per_day_least_significant_first():
+    start, end = date(2030, 1, 1), date(2030, 1, 31)
+    bits = base64.b64decode(encode_bitmap([date(2030, 1, 1), date(2030, 1, 10), date(2030, 1, 31)], start, end))
+    assert bits == bytes([0b00000001, 0b00000010, 0b00000000, 0b01000000])
+
+
+def test_end_day_is_included():
+    assert base64.b64decode(encode_bitmap([], date(2030, 1, 1), date(2030, 1, 8))) == bytes(1)
+    assert base64.b64decode(encode_bitmap([date(2030, 1, 9)], date(2030, 1, 1), date(2030, 1, 9))) == bytes([0, 1])
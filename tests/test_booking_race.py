@@ -0,0 +1,39 @@
+"""
+Many simultaneous bookings of one slot against a live MongoDB: exactly one wins.
+Set MONGO_URL (and optionally DB_NAME) to run it; skipped otherwise.
+"""
+import asyncio
+import os
+import uuid
+
+import pytest
+
+pytestmark = pytest.mark.skipif(not os.environ.get("MONGO_URL"), reason="needs a live MongoDB (MONGO_URL)")
+
+BOOKINGS = 200
+
+
+def test_exactly_one_booking_wins():
+    import httpx
+    from backend import database, server
+
+    async def race():
+        service_id = f"race-{uuid.uuid4()}"
+        payload = {"service_id": service_id, "appointment_date": "2030-06-15"}
+        transport = httpx.ASGITransport(app=server.app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60) as client:
+                responses = await asyncio.gather(*(
+                    client.post("/api/book-appointment", json={**payload, "email": f"guest{i}@example.com"})
+                    for i in range(BOOKINGS)
+                ))
+            stored = await database.db.appointments.count_documents({"service_id": service_id})
+            await database.db.appointments.delete_many({"service_id": service_id})
+        finally:
+            database.close()
+        return [response.status_code for response in responses], stored
+
+    statuses, stored = asyncio.run(race())
+    assert statuses.count(200) == 1
+    assert statuses.count(400) == BOOKINGS - 1
+    assert stored == 1
@@ -0,0 +1,39 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from backend.pagination import decode_cursor, encode_cursor, keyset_filter, merge_sorted, parse_datetime
+
+
+def test_cursor_round_trip():
+    created = datetime(2030, 6, 15, 12, 30)
+    cursor = encode_cursor([created, "abc", 4.5])
+    assert "=" not in cursor
+    assert decode_cursor(cursor, [parse_datetime, str, float]) == [created, "abc", 4.5]
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", encode_cursor([1]), encode_cursor(["x", "y"])])
+def test_bad_cursor_is_400(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, [int, int])
+    assert error.value.status_code == 400
+
+
+def test_keyset_filter():
+    assert keyset_filter([("id", 1)], ["a"]) == {"id": {"$gt": "a"}}
+    assert keyset_filter([("created_at", -1), ("id", -1)], ["t", "i"]) == {"$or": [
+        {"created_at": {"$lt": "t"}},
+        {"created_at": "t", "id": {"$lt": "i"}},
+    ]}
+
+
+def test_merge_sorted_mixed_directions_and_nulls():
+    pages = [
+        [{"rating": 5.0, "id": "b"}, {"rating": 4.0, "id": "a"}],
+        [{"rating": 5.0, "id": "a"}, {"id": "c"}],
+    ]
+    merged = merge_sorted(pages, [("rating", -1), ("id", 1)], 3)
+    assert [(d.get("rating"), d["id"]) for d in merged] == [(5.0, "a"), (5.0, "b"), (4.0, "a")]
+    ascending = merge_sorted(pages, [("rating", 1), ("id", 1)], 2)
+    assert [d["id"] for d in ascending] == ["c", "a"]
@@ -0,0 +1,35 @@
+import pytest
+
+from backend.pricing import parse_price_range
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("$5000 - $15000", (5000.0, 15000.0, "event")),
+    ("$50 - $150 per person", (50.0, 150.0, "person")),
+    ("From $1,200/hour", (1200.0, 1200.0, "hour")),
+    ("$2.5k", (2500.0, 2500.0, "event")),
+    ("₹50,000 - 80,000", (50000.0, 80000.0, "event")),
+    ("500-1000 INR", (500.0, 1000.0, "event")),
+    ("Rs 500 to 1,000", (500.0, 1000.0, "event")),
+])
+def test_parses_display_strings(text, expected):
+    assert parse_price_range(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("2 day package $500", (500.0, 500.0, "event")),
+    ("up to 200 guests, $40 per plate", (40.0, 40.0, "person")),
+    ("100-200 guests, 5000 per event", (5000.0, 5000.0, "event")),
+])
+def test_counts_are_not_prices(text, expected):
+    assert parse_price_range(text) == expected
+
+
+def test_unit_needs_per_or_slash():
+    # "superb" must not read as "per b"
+    assert parse_price_range("Superb decor $300") == (300.0, 300.0, "event")
+
+
+@pytest.mark.parametrize("text", [None, "", "Call for quote"])
+def test_no_price(text):
+    assert parse_price_range(text) == (None, None, None)
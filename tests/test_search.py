@@ -0,0 +1,86 @@
+from backend.search import ServiceSearchIndex, edit_distance_within, location_filter, location_tokens, tokenize
+
+
+def make_index():
+    index = ServiceSearchIndex()
+    index.rebuild([
+        {"id": "hall", "name": "Royal Palace Banquet Hall", "description": "Elegant hall for weddings",
+         "location": "Downtown", "category": "venues"},
+        {"id": "food", "name": "Gourmet Delights Catering", "description": "Premium wedding catering",
+         "location": "City Center", "category": "catering"},
+        {"id": "lens", "name": "Palace Lens Studio", "description": "Candid wedding photography",
+         "location": "Old Town", "category": "photography"},
+        {"id": "closed", "name": "Palace Gardens", "description": "Outdoor venue",
+         "location": "Downtown", "category": "venues", "availability": False},
+    ])
+    return index
+
+
+def ids(results):
+    return [service_id for service_id, _ in results]
+
+
+def test_tokenize_drops_stopwords_and_case():
+    assert tokenize("The Hall of Fame, Downtown") == ["hall", "fame", "downtown"]
+
+
+def test_unavailable_services_are_skipped():
+    assert sorted(ids(make_index().search("palace"))) == ["hall", "lens"]
+
+
+def test_name_matches_rank_above_description_matches():
+    index = make_index()
+    index.add({"id": "mention", "name": "Stage Hire", "description": "Stages for any hall",
+               "location": "Downtown", "category": "decoration"})
+    assert ids(index.search("hall")) == ["hall", "mention"]
+
+
+def test_every_token_must_match():
+    assert ids(make_index().search("palace wedding photography")) == ["lens"]
+    assert make_index().search("palace catering") == []
+
+
+def test_last_token_is_a_prefix():
+    assert ids(make_index().search("gourm")) == ["food"]
+
+
+def test_fuzzy_matches_typos_only_when_asked():
+    index = make_index()
+    assert index.search("catring") == []
+    assert ids(index.search("catring", fuzzy=True)) == ["food"]
+
+
+def test_filters():
+    index = make_index()
+    assert ids(index.search("palace", category="venues")) == ["hall"]
+    assert ids(index.search("palace", location="old")) == ["lens"]
+    assert sorted(ids(index.search("palace", available_only=False, location="downtown", category="venues"))) == [
+        "closed", "hall"]
+
+
+def test_textless_location_results_are_ordered_by_id():
+    index = make_index()
+    index.add({"id": "band", "name": "Brass Band", "description": "Live music", "location": "Downtown Plaza",
+               "category": "dj"})
+    assert ids(index.search(location="down")) == ["band", "hall"]
+
+
+def test_remove_and_readd():
+    index = make_index()
+    index.remove("hall")
+    assert ids(index.search("banquet")) == []
+    index.add({"id": "hall", "name": "Banquet Rooms", "description": "", "location": "Riverside", "category": "venues"})
+    assert ids(index.search("banquet", location="river")) == ["hall"]
+    assert len(index) == 4
+
+
+def test_edit_distance_within():
+    assert edit_distance_within("catering", "catring", 1)
+    assert not edit_distance_within("catering", "cattle", 1)
+
+
+def test_location_tokens_and_filter():
+    assert location_tokens("City Center, Old City") == ["center", "city", "old"]
+    assert location_filter("the") is None
+    query = location_filter("Old ci")
+    assert [regex.pattern for regex in query["location_tokens"]["$all"]] == ["^old", "^ci"]
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from backend import service_import_routes
+from backend.service_import_routes import iter_csv_rows, iter_lines, iter_ndjson_rows
+
+
+async def chunks(*parts):
+    for part in parts:
+        yield part
+
+
+def collect(rows):
+    async def run():
+        return [row async for row in rows]
+    return asyncio.run(run())
+
+
+def test_lines_split_across_chunks():
+    lines = collect(iter_lines(chunks(b"a,b\r\n1,", b"2\n3,4")))
+    assert lines == ["a,b", "1,2", "3,4"]
+
+
+def test_overlong_line_is_rejected(monkeypatch):
+    monkeypatch.setattr(service_import_routes, "IMPORT_MAX_LINE_BYTES", 4)
+    with pytest.raises(HTTPException):
+        collect(iter_lines(chunks(b"123456789")))
+
+
+def test_ndjson_rows():
+    rows = collect(iter_ndjson_rows(chunks('{"name": "a"}', "", "{oops", "[1]")))
+    assert rows[0] == (1, {"name": "a"}, None)
+    assert rows[1][0] == 2 and rows[1][2].startswith("Invalid JSON")
+    assert rows[2] == (3, None, "Each line must be a JSON object")
+
+
+def test_csv_rows_with_quoted_newline_and_empty_cells():
+    lines = chunks("name,description,rating", 'Hall,"Big', 'room, with stage",', "Short,row")
+    rows = collect(iter_csv_rows(lines))
+    assert rows[0] == (1, {"name": "Hall", "description": "Big\nroom, with stage"}, None)
+    assert rows[1] == (2, None, "Expected 3 columns, got 2")
+
+
+def test_csv_unterminated_quote():
+    rows = collect(iter_csv_rows(chunks("name", '"never closed')))
+    assert rows == [(1, None, "Unterminated quoted field")]
+
+
+def test_upsert_leaves_missing_fields_alone(monkeypatch):
+    from backend.models import Service
+
+    class Services:
+        operations = []
+
+        async def bulk_write(self, operations, ordered):
+            self.operations.extend(operations)
+            return type("Result", (), {"upserted_count": 0, "matched_count": len(operations)})()
+
+    monkeypatch.setattr(service_import_routes, "db", type("Db", (), {"services": Services()})())
+    service = Service(name="Hall", category="venues", description="", price_range="Call us", location="Downtown",
+                      image_url="", contact_phone="", contact_email="")
+    doc = {**service.model_dump(), "category": "venues"}
+    asyncio.run(service_import_routes.write_batch([(1, doc)], service_import_routes.ImportReport()))
+
+    update = Services.operations[0]._doc
+    assert "geo" not in update["$set"]
+    # Derived from price_range, so cleared along with it
+    assert update["$set"]["min_price"] is None
+    assert set(update["$setOnInsert"]) == {"created_at", "rating", "review_count"}
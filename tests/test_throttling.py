@@ -0,0 +1,47 @@
+from backend.throttling import TokenBucketLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_burst_then_refill():
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(burst=3, per_minute=60, clock=clock)
+    assert [limiter.hit("ip")[0] for _ in range(3)] == [True, True, True]
+    allowed, retry_after = limiter.hit("ip")
+    assert not allowed and retry_after == 1.0
+    clock.now += 1
+    assert limiter.hit("ip")[0]
+
+
+def test_keys_are_independent():
+    limiter = TokenBucketLimiter(burst=1, per_minute=1, clock=FakeClock())
+    assert limiter.hit("a")[0]
+    assert not limiter.hit("a")[0]
+    assert limiter.hit("b")[0]
+
+
+def test_full_buckets_are_dropped():
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(burst=2, per_minute=60, wheel_slots=8, clock=clock)
+    limiter.hit("a")
+    limiter.hit("b")
+    assert len(limiter) == 2
+    clock.now += 2
+    limiter.hit("c")
+    assert len(limiter) == 1
+
+
+def test_buckets_due_beyond_one_wheel_turn_are_kept():
+    clock = FakeClock()
+    # Refills one token a minute, so an empty bucket lives far longer than the 8 s wheel
+    limiter = TokenBucketLimiter(burst=1, per_minute=1, wheel_slots=8, clock=clock)
+    limiter.hit("slow")
+    clock.now += 20
+    limiter.hit("other")
+    assert not limiter.hit("slow")[0]